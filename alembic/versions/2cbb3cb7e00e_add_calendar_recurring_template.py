@@ -0,0 +1,71 @@
+"""add calendar recurring template
+
+Revision ID: 2cbb3cb7e00e
+Revises: 20e9fd0dbbe2
+Create Date: 2026-10-18 19:32:26.908280
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "2cbb3cb7e00e"
+down_revision: Union[str, None] = "20e9fd0dbbe2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 기존 반복 일정은 가장 먼저 시작하는 남은 일정의 내용으로 채웁니다.
+BACKFILL = """
+UPDATE calendar_recurring
+SET contact_id = calendar.contact_id,
+    template = jsonb_build_object(
+        'name', calendar.name,
+        'start_dt', calendar.start_dt,
+        'end_dt', calendar.end_dt,
+        'is_all_day', coalesce(calendar.is_all_day, false),
+        'remind_interval', calendar.remind_interval,
+        'is_important', calendar.is_important,
+        'content', calendar.content,
+        'is_complete', false,
+        'completed_at', null,
+        'is_repeat', calendar.is_repeat,
+        'tags', calendar.tags
+    )
+FROM (
+    SELECT DISTINCT ON (calendar_recurring_id) *
+    FROM calendar
+    WHERE calendar_recurring_id IS NOT NULL AND deleted_at IS NULL
+    ORDER BY calendar_recurring_id, start_dt
+) AS calendar
+WHERE calendar.calendar_recurring_id = calendar_recurring.id
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        "calendar_recurring", sa.Column("contact_id", sa.UUID(), nullable=True)
+    )
+    op.add_column(
+        "calendar_recurring",
+        sa.Column("template", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+    op.create_foreign_key(
+        "calendar_recurring_contact_id_fkey",
+        "calendar_recurring",
+        "contact",
+        ["contact_id"],
+        ["id"],
+    )
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "calendar_recurring_contact_id_fkey", "calendar_recurring", type_="foreignkey"
+    )
+    op.drop_column("calendar_recurring", "template")
+    op.drop_column("calendar_recurring", "contact_id")
@@ -0,0 +1,75 @@
+"""add keyset pagination indexes
+
+Revision ID: 46bc5bac7f72
+Revises: b1a60f6d610c
+Create Date: 2026-10-18 18:24:08.210208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "46bc5bac7f72"
+down_revision: Union[str, None] = "b1a60f6d610c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 조회를 막지 않도록 새 인덱스를 먼저 만든 뒤 기존 인덱스를 삭제합니다.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "calendar_contact_id_start_dt_id_idx",
+            "calendar",
+            ["contact_id", "start_dt", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "calendar_user_id_start_dt_id_idx",
+            "calendar",
+            ["user_id", "start_dt", "id"],
+            unique=False,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "contact_user_id_updated_at_id_idx",
+            "contact",
+            ["user_id", sa.text("updated_at DESC"), sa.text("id DESC")],
+            unique=False,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "calendar_contact_id_start_dt_idx",
+            table_name="calendar",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "calendar_user_id_start_dt_idx",
+            table_name="calendar",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.create_index(
+        "calendar_user_id_start_dt_idx",
+        "calendar",
+        ["user_id", "start_dt"],
+        unique=False,
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+    op.create_index(
+        "calendar_contact_id_start_dt_idx",
+        "calendar",
+        ["contact_id", "start_dt"],
+        unique=False,
+    )
+    op.drop_index("contact_user_id_updated_at_id_idx", table_name="contact")
+    op.drop_index("calendar_user_id_start_dt_id_idx", table_name="calendar")
+    op.drop_index("calendar_contact_id_start_dt_id_idx", table_name="calendar")
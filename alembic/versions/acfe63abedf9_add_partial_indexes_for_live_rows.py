@@ -0,0 +1,112 @@
+"""add partial indexes for live rows
+
+Revision ID: acfe63abedf9
+Revises: 46bc5bac7f72
+Create Date: 2026-10-18 18:26:29.489850
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "acfe63abedf9"
+down_revision: Union[str, None] = "46bc5bac7f72"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+LIVE = sa.text("deleted_at IS NULL")
+VIRTUAL = sa.text("is_virtual IS true AND deleted_at IS NULL")
+
+
+def upgrade() -> None:
+    # 조회를 막지 않도록 새 인덱스를 먼저 만든 뒤 기존 인덱스를 삭제합니다.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "user_uid_uq",
+            "user",
+            ["uid"],
+            unique=True,
+            postgresql_where=LIVE,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "calendar_virtual_contact_id_idx",
+            "calendar",
+            ["contact_id"],
+            unique=False,
+            postgresql_where=VIRTUAL,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "calendar_virtual_user_id_idx",
+            "calendar",
+            ["user_id"],
+            unique=False,
+            postgresql_where=VIRTUAL,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "calendar_calendar_recurring_id_start_dt_idx",
+            "calendar",
+            ["calendar_recurring_id", "start_dt"],
+            unique=False,
+            postgresql_where=LIVE,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "calendar_contact_calendar_id_idx",
+            "calendar_contact",
+            ["calendar_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "calendar_recurring_materialized_until_live_idx",
+            "calendar_recurring",
+            ["materialized_until"],
+            unique=False,
+            postgresql_where=sa.text(
+                "materialized_until IS NOT NULL AND deleted_at IS NULL"
+            ),
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "contact_user_id_idx", table_name="contact", postgresql_concurrently=True
+        )
+        op.drop_index(
+            "calendar_recurring_materialized_until_idx",
+            table_name="calendar_recurring",
+            postgresql_concurrently=True,
+        )
+    # 제약 조건은 CONCURRENTLY 로 삭제할 수 없으므로 user 테이블에 ACCESS EXCLUSIVE
+    # 잠금을 잡습니다. 인덱스만 삭제하므로 금방 끝나지만, 잠금을 기다리는 동안
+    # user 조회도 대기하므로 트래픽이 적을 때 실행합니다.
+    op.drop_constraint("user_uid_key", "user", type_="unique")
+    op.execute(
+        "ALTER INDEX calendar_recurring_materialized_until_live_idx "
+        "RENAME TO calendar_recurring_materialized_until_idx"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "calendar_recurring_materialized_until_idx", table_name="calendar_recurring"
+    )
+    op.create_index(
+        "calendar_recurring_materialized_until_idx",
+        "calendar_recurring",
+        ["materialized_until"],
+        unique=False,
+        postgresql_where=sa.text("materialized_until IS NOT NULL"),
+    )
+    op.create_index("contact_user_id_idx", "contact", ["user_id"], unique=False)
+    op.create_unique_constraint("user_uid_key", "user", ["uid"])
+    op.drop_index("calendar_contact_calendar_id_idx", table_name="calendar_contact")
+    op.drop_index("calendar_calendar_recurring_id_start_dt_idx", table_name="calendar")
+    op.drop_index("calendar_virtual_user_id_idx", table_name="calendar")
+    op.drop_index("calendar_virtual_contact_id_idx", table_name="calendar")
+    op.drop_index("user_uid_uq", table_name="user")
@@ -0,0 +1,78 @@
+"""add calendar user_id
+
+Revision ID: b1a60f6d610c
+Revises: bd6e099c2cba
+Create Date: 2026-10-18 18:15:48.703887
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b1a60f6d610c"
+down_revision: Union[str, None] = "bd6e099c2cba"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BATCH_PAGES = 1000
+
+BACKFILL = """
+UPDATE calendar
+SET user_id = contact.user_id
+FROM contact
+WHERE calendar.contact_id = contact.id
+AND calendar.user_id IS NULL
+"""
+
+
+def upgrade() -> None:
+    op.add_column("calendar", sa.Column("user_id", sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        "calendar_user_id_fkey", "calendar", "user", ["user_id"], ["id"]
+    )
+
+    # 큰 테이블을 오래 잠그지 않도록 트랜잭션 밖에서 페이지 범위별로 나눠서 채웁니다.
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        pages = connection.execute(
+            sa.text(
+                "SELECT pg_relation_size('calendar') "
+                "/ current_setting('block_size')::int"
+            )
+        ).scalar_one()
+        for page in range(0, pages + 1, BATCH_PAGES):
+            connection.execute(
+                sa.text(
+                    BACKFILL
+                    + "AND calendar.ctid >= CAST(CAST(:start AS text) AS tid) "
+                    + "AND calendar.ctid < CAST(CAST(:end AS text) AS tid)"
+                ),
+                {"start": f"({page},0)", "end": f"({page + BATCH_PAGES},0)"},
+            )
+
+        op.create_index(
+            "calendar_user_id_start_dt_idx",
+            "calendar",
+            ["user_id", "start_dt"],
+            unique=False,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+
+    # 마이그레이션 도중 추가된 일정을 채운 뒤 NOT NULL 로 변경합니다.
+    op.execute(BACKFILL)
+    op.alter_column("calendar", "user_id", nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "calendar_user_id_start_dt_idx",
+        table_name="calendar",
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+    op.drop_constraint("calendar_user_id_fkey", "calendar", type_="foreignkey")
+    op.drop_column("calendar", "user_id")
@@ -1,8 +1,11 @@
 import datetime
+import hashlib
+import time
 from typing import Any
 from app import schemas
 
 from fastapi import Response
+from app.base.cache import TTLCache
 from app.base.config import config
 
 import jwt
@@ -10,6 +13,8 @@ import jwt
 from app.utils import tz_now
 
 issuer = "team8"  # 추후 변경
+access_token_expires = datetime.timedelta(hours=1)
+refresh_token_expires = datetime.timedelta(days=21)
 
 
 def create_token(
@@ -24,27 +29,42 @@ def create_token(
     return jwt.encode(payload, config.secret_key, algorithm=algorithm)
 
 
+# 검증을 마친 토큰의 payload 를 만료시까지 보관합니다. (키는 토큰의 해시)
+token_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+    config.token_cache_size, ttl=60 * 60 * 24 * 21
+)
+
+
 def decode_token(token: str, algorithm: str = "HS256") -> dict[str, Any]:
-    """토큰을 디코딩합니다."""
-    options = {"verify_exp": True, "verify_iss": True}
-    return jwt.decode(
-        token,
-        config.secret_key,
-        options=options,
-        issuer=issuer,
-        algorithms=[algorithm],
-    )
+    """토큰을 디코딩합니다. 검증한 토큰은 만료될 때까지 캐시합니다."""
+    key = hashlib.sha256(f"{algorithm}:{token}".encode()).hexdigest()
+    payload = token_cache.get(key)
+    if payload is None:
+        options = {"verify_exp": True, "verify_iss": True}
+        payload = jwt.decode(
+            token,
+            config.secret_key,
+            options=options,
+            issuer=issuer,
+            algorithms=[algorithm],
+        )
+        token_cache.set(key, payload, ttl=payload.get("exp", 0) - time.time())
+    return dict(payload)
 
 
 def login(response: Response, user: schemas.UserProfile) -> None:
     """쿠키를 응답하여 자동 로그인합니다."""
-    payload = {"user_id": user.id}
-    access_token = create_token(payload, datetime.timedelta(hours=1))
-    refresh_token = create_token(payload, datetime.timedelta(days=21))
-    _set_cookie(response, key="access_token", value=access_token)
+    refresh_access_token(response, user.id)
+    refresh_token = create_token({"user_id": user.id}, refresh_token_expires)
     _set_cookie(response, key="refresh_token", value=refresh_token)
 
 
+def refresh_access_token(response: Response, user_id: int) -> None:
+    """access token 쿠키를 새로 발급합니다."""
+    access_token = create_token({"user_id": user_id}, access_token_expires)
+    _set_cookie(response, key="access_token", value=access_token)
+
+
 def _set_cookie(response: Response, key: str, value: str) -> None:
     response.set_cookie(
         key=key,
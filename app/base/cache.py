@@ -0,0 +1,84 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """크기가 제한된 프로세스 내 LRU 캐시입니다.
+
+    값마다 만료 시간을 정할 수 있고, 가득 차면 가장 오래 쓰지 않은 값부터 버립니다.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K) -> V | None:
+        item = self._data.get(key)
+        if item is None or item[0] <= time.monotonic():
+            if item is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """값을 저장합니다. ttl(초)을 주지 않으면 기본 ttl 을 사용합니다."""
+        ttl = self._ttl if ttl is None else min(ttl, self._ttl)
+        if ttl <= 0 or self._maxsize <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: K) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+class SingleFlight(Generic[K, V]):
+    """같은 키로 동시에 들어온 호출을 하나로 모읍니다.
+
+    먼저 들어온 호출의 fn 을 별도의 태스크에서 실행하고, 모두 그 결과를 함께 받습니다.
+    먼저 들어온 요청이 취소되어도 태스크는 끝까지 실행됩니다.
+    태스크가 실패하면 기다리던 호출들은 각자 fn 을 실행합니다.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[K, asyncio.Task[V]] = {}
+        self.shared = 0
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        task = self._calls.get(key)
+        if task is not None:
+            self.shared += 1
+            try:
+                return await asyncio.shield(task)
+            except Exception:
+                return await fn()
+
+        task = asyncio.ensure_future(fn())
+        self._calls[key] = task
+        task.add_done_callback(lambda task: self._done(key, task))
+        return await asyncio.shield(task)
+
+    def _done(self, key: K, task: asyncio.Task[V]) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # 기다리는 호출이 없어도 경고를 남기지 않습니다.
@@ -10,6 +10,56 @@ class Config(BaseSettings):
     frontend_url: str
     frontend_domain: str
 
+    # 커넥션 풀 설정 (엔진마다 적용)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30  # 초 단위
+    db_pool_recycle: int = -1  # 초 단위, -1 이면 재생성하지 않음
+    db_pool_pre_ping: bool = False
+    db_statement_cache_size: int = 100
+    # PgBouncer(transaction 모드)를 거쳐 접속합니다. prepared statement 캐시를 끕니다.
+    db_pgbouncer: bool = False
+
+    # 요청이 동시에 사용하는 DB 세션 수 제한 (없으면 풀 크기 + overflow)
+    db_admission_limit: int | None = None
+    # 제한을 넘은 요청의 대기열 크기와 대기 시간, 넘으면 503 으로 응답
+    db_admission_queue_size: int = 100
+    db_admission_timeout: float = 1  # 초 단위
+    db_admission_retry_after: int = 1  # 초 단위
+
+    # 요청의 쿼리 제한 시간 (밀리초 단위, 0 이면 제한 없음)
+    # 라우트별로 deps.statement_timeout 으로 바꿀 수 있습니다.
+    db_statement_timeout: int = 1000
+
+    # GET 요청의 읽기 전용 트랜잭션을 DEFERRABLE 로 시작 (SERIALIZABLE 에서만 효과)
+    db_readonly_deferrable: bool = False
+
+    # GET 요청의 읽기 전용 세션을 나눠 받을 replica 주소 목록 (JSON 배열)
+    db_replica_urls: list[str] = []
+    # 연결 오류가 난 replica 를 제외하는 시간 (초 단위)
+    db_replica_eject_seconds: float = 30
+
+    # /metrics 조회에 필요한 토큰 (Authorization: Bearer), 없으면 /metrics 를 끕니다.
+    metrics_token: str | None = None
+
+    # 소셜 로그인 제공자 API 호출 설정
+    oauth_timeout: float = 5  # 초 단위
+    oauth_retries: int = 2
+    oauth_pool_size: int = 10
+
+    # 검증한 토큰을 캐시할 개수
+    token_cache_size: int = 10000
+    # 유저 프로필 캐시
+    user_profile_cache_size: int = 10000
+    user_profile_cache_ttl: float = 60  # 초 단위
+
+    # 반복 일정을 원본 하나로 저장하고 조회시 펼칩니다. (끄면 원본을 조회하지 않습니다)
+    calendar_recurring_virtual: bool = False
+    # 반복 일정을 지정한 일수만큼만 미리 생성하고 나머지는 워커가 이어서 생성합니다.
+    calendar_recurring_horizon_days: int | None = None
+    calendar_recurring_worker_interval: float = 60  # 초 단위
+    calendar_recurring_worker_batch_size: int = 100
+
     class Config:
         env_file = "./secrets/.env"
         env_file_encoding = "utf-8"
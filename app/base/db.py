@@ -1,23 +1,37 @@
 from __future__ import annotations
 
+import asyncio
+import collections
 import datetime
-from typing import Any
+import itertools
+import re
+import time
+import uuid
+from typing import Any, cast
 
 import sqlalchemy as sa
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    ORMExecuteState,
+    Session,
+    mapped_column,
+)
 
-from asyncio import current_task
-from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
 
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
-    async_scoped_session,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql.schema import CallableColumnDefault, ScalarElementColumnDefault
 
 from app.base.config import config
+from app.exceptions import ReadOnlyError, ServiceUnavailableError
 
 
 class Base(DeclarativeBase):
@@ -28,6 +42,27 @@ class Base(DeclarativeBase):
             setattr(self, field, value)
 
 
+@sa.event.listens_for(Base, "init", propagate=True)
+def set_client_defaults(target: Base, args: Any, kwargs: dict[str, Any]) -> None:
+    """파이썬에서 정하는 기본값은 객체 생성시 미리 채웁니다.
+
+    uuid4 같은 기본키와 False 같은 고정값을 flush 전에도 사용할 수 있으므로
+    INSERT 를 commit 까지 모아서 보낼 수 있습니다.
+    """
+    mapper = sa.inspect(type(target))
+    for prop in mapper.column_attrs:
+        column = prop.columns[0]
+        if prop.key in kwargs or not isinstance(column, sa.Column):
+            continue
+        default = column.default
+        # setattr 은 매퍼 설정 전일 수 있으므로 생성자 인자로 넘깁니다.
+        if isinstance(default, ScalarElementColumnDefault):
+            kwargs[prop.key] = default.arg
+        elif column.primary_key and isinstance(default, CallableColumnDefault):
+            # (uuid4 처럼 인자가 없는 기본값은 실행 컨텍스트를 사용하지 않습니다.)
+            kwargs[prop.key] = default.arg(None)  # type: ignore[arg-type]
+
+
 class TimestampBase(Base):
     __abstract__ = True
 
@@ -44,32 +79,402 @@ class TimestampBase(Base):
     )
 
 
+class ReadOnlySession(Session):
+    """데이터를 변경하려 하면 ReadOnlyError 를 발생시키는 세션입니다."""
+
+
+@sa.event.listens_for(ReadOnlySession, "before_flush")
+def reject_flush(session: Session, flush_context: Any, instances: Any) -> None:
+    raise ReadOnlyError()
+
+
+@sa.event.listens_for(ReadOnlySession, "do_orm_execute")
+def reject_dml(orm_execute_state: ORMExecuteState) -> None:
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        raise ReadOnlyError()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """커넥션을 받기까지 기다린 시간을 기록하는 커넥션 풀입니다."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_count = 0
+        self.wait_seconds = 0.0
+        self.wait_max_seconds = 0.0
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - start
+            self.wait_count += 1
+            self.wait_seconds += elapsed
+            self.wait_max_seconds = max(self.wait_max_seconds, elapsed)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "wait_count": self.wait_count,
+            "wait_seconds": self.wait_seconds,
+            "wait_max_seconds": self.wait_max_seconds,
+        }
+
+
+def create_engine(db_url: str) -> AsyncEngine:
+    """config 의 커넥션 풀 설정으로 엔진을 만듭니다."""
+    connect_args: dict[str, Any] = {
+        # SQLAlchemy 의 prepared statement 캐시와 asyncpg 자체 캐시
+        "prepared_statement_cache_size": config.db_statement_cache_size,
+        "statement_cache_size": config.db_statement_cache_size,
+    }
+    if config.db_pgbouncer:
+        # PgBouncer transaction 모드에서는 트랜잭션마다 서버 커넥션이 바뀝니다.
+        # prepared statement 를 캐시하지 않고, 겹치지 않는 이름을 사용합니다.
+        connect_args.update(
+            prepared_statement_cache_size=0,
+            statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid.uuid4()}__",
+        )
+    else:
+        # 기본 쿼리 제한 시간은 커넥션을 열 때 한 번만 설정합니다.
+        # (PgBouncer 는 알 수 없는 시작 파라미터를 거부하므로 SET LOCAL 을 사용합니다.)
+        connect_args["server_settings"] = {
+            "statement_timeout": str(config.db_statement_timeout)
+        }
+    return create_async_engine(
+        db_url,
+        echo=False,
+        poolclass=TimedQueuePool,
+        pool_size=config.db_pool_size,
+        max_overflow=config.db_max_overflow,
+        pool_timeout=config.db_pool_timeout,
+        pool_recycle=config.db_pool_recycle,
+        pool_pre_ping=config.db_pool_pre_ping,
+        connect_args=connect_args,
+    )
+
+
+class ReplicaRouter:
+    """읽기 전용 세션이 사용할 엔진을 replica 들 중에서 round-robin 으로 고릅니다.
+
+    연결 오류가 난 replica 는 eject_seconds 동안 제외하며,
+    모든 replica 가 제외되었다면 primary 를 사용합니다.
+    """
+
+    def __init__(
+        self, primary: AsyncEngine, replicas: list[AsyncEngine], eject_seconds: float
+    ) -> None:
+        self._primary = primary
+        self._replicas = replicas
+        self._eject_seconds = eject_seconds
+        self._ejected_until = [0.0] * len(replicas)
+        self._counter = itertools.count()
+
+    def engine(self) -> AsyncEngine:
+        now = time.monotonic()
+        for _ in range(len(self._replicas)):
+            index = next(self._counter) % len(self._replicas)
+            if self._ejected_until[index] <= now:
+                return self._replicas[index]
+        return self._primary
+
+    def report_error(self, engine: AsyncEngine, exc: Exception) -> None:
+        """연결 오류라면 해당 replica 를 제외합니다."""
+        if engine not in self._replicas:
+            return
+        # asyncpg 는 연결 실패를 DBAPI 에러로 감싸지 않고 OSError 로 던집니다.
+        if isinstance(exc, OSError) or (
+            isinstance(exc, sa.exc.DBAPIError) and exc.connection_invalidated
+        ):
+            index = self._replicas.index(engine)
+            self._ejected_until[index] = time.monotonic() + self._eject_seconds
+
+
+class AdmissionLimiter:
+    """동시에 사용하는 DB 세션 수를 제한합니다.
+
+    자리가 없으면 대기열에서 기다리고, 대기열이 가득 찼거나 timeout 안에
+    자리가 나지 않으면 ServiceUnavailableError 를 발생시킵니다.
+    """
+
+    def __init__(
+        self, limit: int, queue_size: int, timeout: float, retry_after: int
+    ) -> None:
+        self._limit = limit
+        self._semaphore = asyncio.Semaphore(limit)
+        self._queue_size = queue_size
+        self._timeout = timeout
+        self._retry_after = retry_after
+        self._waiting = 0
+        self._in_use = 0
+        self.shed = 0
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncGenerator[None, None]:
+        if self._semaphore.locked() and self._waiting >= self._queue_size:
+            self._reject()
+        self._waiting += 1
+        try:
+            async with asyncio.timeout(self._timeout):
+                await self._semaphore.acquire()
+        except TimeoutError:
+            self._reject()
+        finally:
+            self._waiting -= 1
+        self._in_use += 1
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def try_acquire(self) -> bool:
+        """기다리지 않고 자리를 얻습니다. 얻었다면 release 로 반납해야 합니다."""
+        if self._semaphore.locked():
+            return False
+        await self._semaphore.acquire()  # 자리가 있으므로 바로 반환됩니다.
+        self._in_use += 1
+        return True
+
+    def release(self) -> None:
+        self._in_use -= 1
+        self._semaphore.release()
+
+    def _reject(self) -> None:
+        self.shed += 1
+        raise ServiceUnavailableError(retry_after=self._retry_after)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "limit": self._limit,
+            "in_use": self._in_use,
+            "waiting": self._waiting,
+            "shed": self.shed,
+        }
+
+
+@sa.event.listens_for(Session, "after_begin")
+def set_statement_timeout(
+    session: Session, transaction: Any, connection: sa.Connection
+) -> None:
+    """session.info 의 statement_timeout(밀리초)을 트랜잭션마다 적용합니다.
+
+    None 이거나 커넥션에 설정된 기본값과 같으면 SET LOCAL 을 보내지 않습니다.
+    """
+    timeout = session.info.get("statement_timeout")
+    if timeout is None:
+        return
+    if config.db_pgbouncer or timeout != config.db_statement_timeout:
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout)}")
+
+
 class DB:
-    def __init__(self, db_url: str) -> None:
-        self._engine = create_async_engine(db_url, echo=False)
-        self._session_factory = async_scoped_session(
-            async_sessionmaker(
-                autoflush=False,
-                class_=AsyncSession,
-                bind=self._engine,
-            ),
-            scopefunc=current_task,
+    def __init__(self, db_url: str, replica_urls: list[str] | None = None) -> None:
+        self._engine = create_engine(db_url)
+        self._replica_engines = [create_engine(url) for url in replica_urls or []]
+        self._session_factory = async_sessionmaker(
+            autoflush=False,
+            class_=AsyncSession,
+            bind=self._engine,
+        )
+        readonly_options = dict(
+            postgresql_readonly=True,
+            postgresql_deferrable=config.db_readonly_deferrable,
+        )
+        self._readonly_engine = self._engine.execution_options(**readonly_options)
+        self._readonly_router = ReplicaRouter(
+            self._readonly_engine,
+            [
+                engine.execution_options(**readonly_options)
+                for engine in self._replica_engines
+            ],
+            config.db_replica_eject_seconds,
+        )
+        self.admission = AdmissionLimiter(
+            config.db_admission_limit or config.db_pool_size + config.db_max_overflow,
+            config.db_admission_queue_size,
+            config.db_admission_timeout,
+            config.db_admission_retry_after,
+        )
+        # 제한 시간을 넘겨 취소된 쿼리 수 (라우트별)
+        self.statement_timeouts: collections.Counter[str] = collections.Counter()
+        self._readonly_session_factory = async_sessionmaker(
+            autoflush=False,
+            class_=AsyncSession,
+            sync_session_class=ReadOnlySession,
+        )
+
+    async def gather(
+        self,
+        session: AsyncSession,
+        *funcs: Callable[[AsyncSession], Awaitable[Any]],
+        snapshot: bool = False,
+    ) -> list[Any]:
+        """서로 독립적인 조회 함수들을 각자의 커넥션에서 동시에 실행합니다.
+
+        첫 번째 함수는 session 에서, 나머지는 같은 DB 에 새로 연 읽기 전용 세션에서
+        실행합니다. 새 세션에서는 session 에서 아직 commit 하지 않은 변경은 보이지
+        않습니다. 동시에 쓸 자리가 없으면 session 에서 차례로 실행합니다.
+
+        snapshot 이면 새 세션들은 session 이 스냅샷을 내보낸 시점의 데이터를 봅니다.
+        session 에서 실행되는 함수는 session 의 격리 수준을 따르므로, READ COMMITTED
+        에서는 그 뒤에 commit 된 변경이 보일 수 있습니다. 모든 함수가 같은 시점을
+        보려면 session 을 REPEATABLE READ 트랜잭션으로 시작해야 합니다.
+        """
+        snapshot_id = None
+        if snapshot:
+            snapshot_id = await session.scalar(sa.text("SELECT pg_export_snapshot()"))
+        lock = asyncio.Lock()
+
+        async def run_in_session(func: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+            async with lock:
+                return await func(session)
+
+        async def run_in_fork(func: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+            if not await self.admission.try_acquire():
+                return await run_in_session(func)
+            try:
+                async with self._fork(session, snapshot_id) as fork:
+                    return await func(fork)
+            finally:
+                self.admission.release()
+
+        return await asyncio.gather(
+            run_in_session(funcs[0]), *[run_in_fork(func) for func in funcs[1:]]
         )
 
     @asynccontextmanager
-    async def session(self) -> AsyncGenerator[AsyncSession, None]:
-        session: AsyncSession = self._session_factory()
+    async def _fork(
+        self, session: AsyncSession, snapshot_id: str | None
+    ) -> AsyncGenerator[AsyncSession, None]:
+        bind = session.bind
+        if bind is self._engine:
+            bind = self._readonly_engine
+        # rollback 하면 조회한 객체가 만료되므로 close 만 합니다.
+        async with self._readonly_session_factory(
+            bind=bind, info=dict(session.info)
+        ) as fork:
+            if snapshot_id:
+                # 스냅샷은 REPEATABLE READ 이상의 트랜잭션에서만 가져올 수 있습니다.
+                await fork.connection(
+                    execution_options={"isolation_level": "REPEATABLE READ"}
+                )
+                # SET TRANSACTION 은 파라미터를 받지 않습니다. (서버가 만든 값만 사용)
+                if not re.fullmatch(r"[0-9A-F-]+", snapshot_id):
+                    raise ValueError(f"{snapshot_id} 는 스냅샷 ID 가 아닙니다.")
+                await fork.execute(sa.text(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'"))
+            yield fork
+
+    def pool_stats(self) -> dict[str, dict[str, Any]]:
+        """엔진별 커넥션 풀 상태를 반환합니다. (primary, replica-0, ...)"""
+        engines = {"primary": self._engine}
+        for i, engine in enumerate(self._replica_engines):
+            engines[f"replica-{i}"] = engine
+        return {
+            label: cast(TimedQueuePool, engine.pool).stats()
+            for label, engine in engines.items()
+        }
+
+    async def dispose(self) -> None:
+        """primary 와 replica 엔진의 커넥션을 모두 닫습니다."""
+        for engine in [self._engine, *self._replica_engines]:
+            await engine.dispose()
+
+    @asynccontextmanager
+    async def session(
+        self, readonly: bool = False, statement_timeout: int | None = None
+    ) -> AsyncGenerator[AsyncSession, None]:
+        """세션을 만들고 끝날 때 commit 합니다.
+
+        readonly 면 READ ONLY 트랜잭션을 사용하고 commit 대신 rollback 합니다.
+        replica 가 설정되어 있다면 readonly 세션은 replica 에서 실행됩니다.
+        statement_timeout(밀리초)을 넘긴 쿼리는 취소됩니다. None 이면 커넥션의 기본값을
+        사용하고, 제한이 없어야 한다면 0 을 넘깁니다.
+        """
+        if readonly:
+            engine = self._readonly_router.engine()
+            session: AsyncSession = self._readonly_session_factory(bind=engine)
+        else:
+            session = self._session_factory()
+        session.info["statement_timeout"] = statement_timeout
         try:
             yield session
-            if session.is_active:
+            if readonly:
+                # 변경된 객체가 남아있다면 flush 에서 ReadOnlyError 가 발생합니다.
+                await session.flush()
+                await session.rollback()
+            elif session.is_active:
                 await session.commit()
             else:
                 await session.rollback()
-        except Exception:
+        except Exception as e:
+            if readonly:
+                self._readonly_router.report_error(engine, e)
             await session.rollback()
             raise
         finally:
-            await self._session_factory.remove()
+            await session.close()
+
+
+class LazySession:
+    """처음 요청할 때 세션을 만들고, 컨텍스트가 끝나면 commit 또는 rollback 합니다.
+
+    DB 를 사용하지 않는 요청은 세션을 만들지 않습니다.
+    """
+
+    def __init__(self, db: DB, readonly: bool = False) -> None:
+        self._db = db
+        self._readonly = readonly
+        self._statement_timeout = config.db_statement_timeout
+        self._stack = AsyncExitStack()
+        self._session: AsyncSession | None = None
+
+    def allow_write(self) -> None:
+        """읽기 전용 요청에서도 쓰기 세션을 사용합니다. (세션 생성 전에 호출)"""
+        if self._session is not None and self._readonly:
+            raise ReadOnlyError("읽기 전용 세션이 이미 생성되었습니다.")
+        self._readonly = False
+
+    async def set_statement_timeout(self, timeout: int) -> None:
+        """쿼리 제한 시간(밀리초)을 바꿉니다. 진행 중인 트랜잭션에도 적용합니다."""
+        self._statement_timeout = timeout
+        if self._session is not None:
+            self._session.info["statement_timeout"] = timeout
+            if self._session.in_transaction():
+                await self._session.execute(
+                    sa.text(f"SET LOCAL statement_timeout = {int(timeout)}")
+                )
+
+    async def get(self) -> AsyncSession:
+        if self._session is None:
+            # 세션을 닫은 뒤에 자리를 반납하도록 먼저 등록합니다.
+            await self._stack.enter_async_context(self._db.admission.acquire())
+            self._session = await self._stack.enter_async_context(
+                self._db.session(self._readonly, self._statement_timeout)
+            )
+        return self._session
+
+    async def rollback(self) -> None:
+        """세션을 사용했다면 진행 중인 트랜잭션을 rollback 합니다."""
+        if self._session is not None:
+            await self._session.rollback()
+
+    async def close(self) -> None:
+        """세션을 사용했다면 commit(또는 rollback) 후 닫습니다."""
+        await self._stack.aclose()
+
+    async def __aenter__(self) -> LazySession:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> bool | None:
+        return await self._stack.__aexit__(*exc_info)
 
 
-db = DB(str(config.db_url))
+db = DB(str(config.db_url), config.db_replica_urls)
@@ -0,0 +1,84 @@
+import asyncio
+import re
+import time
+from typing import Any, Awaitable, Callable, Mapping
+
+import httpx
+import jwt
+
+from app.exceptions import ValidationError
+
+
+def cache_max_age(headers: Mapping[str, str]) -> float:
+    """Cache-Control 의 max-age 에서 Age 를 뺀 남은 캐시 시간(초)을 반환합니다."""
+    cache_control = headers.get("Cache-Control", "").lower()
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+    match = re.search(r"max-age=(\d+)", cache_control)
+    if match is None:
+        return 0
+    try:
+        age = int(headers.get("Age", 0))
+    except ValueError:
+        age = 0
+    return max(int(match.group(1)) - age, 0)
+
+
+class JWKSCache:
+    """JWKS 공개키를 Cache-Control 이 허락하는 동안 보관합니다.
+
+    모르는 kid 를 받으면 키가 교체된 것으로 보고 다시 가져오되,
+    min_refresh_interval(초)에 한 번으로 제한합니다.
+    동시에 들어온 갱신 요청은 한 번의 호출로 모읍니다.
+    """
+
+    def __init__(self, url: str, min_refresh_interval: float = 60) -> None:
+        self.url = url
+        self._min_refresh_interval = min_refresh_interval
+        self._keys: dict[str, Any] = {}
+        self._fetched_at = -float("inf")
+        self._expires_at = -float("inf")
+        self._lock = asyncio.Lock()
+        self.fetches = 0
+
+    def _stale(self, kid: str) -> bool:
+        now = time.monotonic()
+        if now >= self._expires_at:
+            return True
+        return (
+            kid not in self._keys
+            and now - self._fetched_at >= self._min_refresh_interval
+        )
+
+    async def get_key(
+        self, fetch: Callable[[str], Awaitable[httpx.Response]], kid: str
+    ) -> Any:
+        if self._stale(kid):
+            async with self._lock:
+                # 기다리는 동안 다른 요청이 이미 가져왔을 수 있습니다.
+                if self._stale(kid):
+                    await self._refresh(fetch)
+
+        key = self._keys.get(kid)
+        if key is None:
+            raise ValidationError("알 수 없는 서명 키입니다.")
+        return key
+
+    async def _refresh(self, fetch: Callable[[str], Awaitable[httpx.Response]]) -> None:
+        res = await fetch(self.url)
+        if res.status_code != 200:
+            raise ValidationError(f"서명 키를 가져오지 못했습니다. {res.status_code}")
+
+        algorithm = jwt.get_algorithm_by_name("RS256")
+        self._keys = {
+            jwk["kid"]: algorithm.from_jwk(jwk)
+            for jwk in res.json()["keys"]
+            if jwk.get("kty") == "RSA" and "kid" in jwk
+        }
+        self._fetched_at = time.monotonic()
+        self._expires_at = self._fetched_at + cache_max_age(res.headers)
+        self.fetches += 1
+
+    def clear(self) -> None:
+        self._keys = {}
+        self._fetched_at = self._expires_at = -float("inf")
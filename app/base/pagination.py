@@ -0,0 +1,42 @@
+import base64
+import binascii
+from datetime import datetime
+from uuid import UUID
+
+# 다음 페이지 커서를 전달하는 응답 헤더
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(dt: datetime, item_id: UUID) -> str:
+    """정렬 키(일시, 아이디)를 페이지네이션 커서로 변환합니다.
+
+    Args:
+        dt: 마지막 항목의 정렬 일시
+        item_id: 마지막 항목의 아이디
+
+    Returns:
+        불투명한 커서 문자열
+    """
+    raw = f"{dt.isoformat()}|{item_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """페이지네이션 커서를 정렬 키(일시, 아이디)로 변환합니다.
+
+    Args:
+        cursor: encode_cursor 로 만든 커서
+
+    Returns:
+        타임존이 포함된 일시와 아이디
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        raw_dt, raw_id = raw.split("|")
+        dt = datetime.fromisoformat(raw_dt)
+        item_id = UUID(raw_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"invalid cursor: {cursor}") from e
+    if dt.tzinfo is None:
+        raise ValueError(f"invalid cursor: {cursor}")
+    return dt, item_id
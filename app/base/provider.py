@@ -1,7 +1,116 @@
-from typing import TypedDict
+import asyncio
+from typing import Any, TypedDict
 from app.exceptions import ValidationError
-import requests
+import httpx
+import jwt
 from app.base.config import config
+from app.base.jwks import JWKSCache
+
+GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
+GOOGLE_USER_INFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+KAKAO_USER_INFO_URL = "https://kapi.kakao.com/v2/user/me"
+
+
+class RetryTransport(httpx.AsyncBaseTransport):
+    """실패한 요청을 지수 백오프로 다시 보내는 트랜스포트입니다.
+
+    연결 실패는 모든 요청을, 타임아웃과 5xx 응답은 GET 요청만 재시도합니다.
+    (인가 코드는 한 번만 쓸 수 있으므로 POST 는 보낸 뒤에는 재시도하지 않습니다)
+    """
+
+    retry_statuses = (500, 502, 503, 504)
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        retries: int,
+        backoff_factor: float = 0.2,
+    ) -> None:
+        self._transport = transport
+        self._retries = retries
+        self._backoff_factor = backoff_factor
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        idempotent = request.method == "GET"
+        attempt = 0
+        while True:
+            try:
+                response = await self._transport.handle_async_request(request)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                if attempt >= self._retries:
+                    raise
+            except (httpx.TimeoutException, httpx.NetworkError):
+                if not idempotent or attempt >= self._retries:
+                    raise
+            else:
+                if (
+                    not idempotent
+                    or attempt >= self._retries
+                    or response.status_code not in self.retry_statuses
+                ):
+                    return response
+                await response.aclose()
+
+            await asyncio.sleep(self._backoff_factor * 2**attempt)
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class OAuthClient:
+    """소셜 로그인 제공자의 API 를 호출하는 HTTP 클라이언트입니다.
+
+    커넥션을 재사용하도록 하나의 httpx.AsyncClient 를 공유합니다.
+    스레드풀을 쓰지 않으므로 제공자가 느려도 다른 요청의 스레드를 뺏지 않고,
+    동시 연결 수는 pool_size 로 제한됩니다.
+    앱이 시작할 때 만들고 종료할 때 닫습니다.
+    """
+
+    def __init__(self, timeout: float, retries: int, pool_size: int) -> None:
+        limits = httpx.Limits(
+            max_connections=pool_size, max_keepalive_connections=pool_size
+        )
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=limits,
+            transport=RetryTransport(httpx.AsyncHTTPTransport(limits=limits), retries),
+        )
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._client.get(url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._client.post(url, **kwargs)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+google_jwks = JWKSCache(GOOGLE_JWKS_URL)
+
+
+async def verify_google_id_token(client: OAuthClient, id_token: str) -> dict[str, Any]:
+    """구글 ID 토큰의 서명과 클레임을 캐시된 공개키로 확인합니다."""
+    try:
+        kid = jwt.get_unverified_header(id_token).get("kid", "")
+        key = await google_jwks.get_key(client.get, kid)
+        payload = jwt.decode(
+            id_token,
+            key,
+            algorithms=["RS256"],
+            audience=config.google_client_id,
+            leeway=30,
+            options={"require": ["exp", "iat", "iss", "aud", "sub"]},
+        )
+    except jwt.InvalidTokenError as e:
+        raise ValidationError(f"ID 토큰이 유효하지 않습니다. {e}")
+
+    if payload["iss"] not in GOOGLE_ISSUERS:
+        raise ValidationError("ID 토큰의 발급자가 올바르지 않습니다.")
+    return payload
 
 
 class ProviderUserInfo(TypedDict):
@@ -18,12 +127,13 @@ class GoogleProviderUserInfo(TypedDict):
 
 
 class KakaoAuthProvider:
-    def __init__(self, token: str) -> None:
+    def __init__(self, client: OAuthClient, token: str) -> None:
+        self._client = client
         self._token = token
 
-    def get_user_info(self) -> ProviderUserInfo:
-        res = requests.get(
-            "https://kapi.kakao.com/v2/user/me",
+    async def get_user_info(self) -> ProviderUserInfo:
+        res = await self._client.get(
+            KAKAO_USER_INFO_URL,
             headers={"Authorization": f"Bearer {self._token}"},
         )
         if res.status_code != 200:
@@ -41,13 +151,19 @@ class KakaoAuthProvider:
 
 class GoogleAuthProvider:
     def __init__(
-        self, code: str = "", access_token: str = "", refresh_token: str = ""
+        self,
+        client: OAuthClient,
+        code: str = "",
+        access_token: str = "",
+        refresh_token: str = "",
     ) -> None:
+        self._client = client
         self._code = code
         self._access_token = access_token
         self._refresh_token = refresh_token
+        self._id_token = ""
 
-    def get_access_token(self) -> str:
+    async def get_access_token(self) -> str:
         data = {
             "code": self._code,
             "client_id": config.google_client_id,
@@ -55,10 +171,7 @@ class GoogleAuthProvider:
             "redirect_uri": config.google_redirect_uri,
             "grant_type": "authorization_code",
         }
-        res = requests.post(
-            "https://oauth2.googleapis.com/token",
-            data=data,
-        )
+        res = await self._client.post(GOOGLE_TOKEN_URL, data=data)
         if res.status_code != 200:
             try:
                 message = res.json()["error_description"]
@@ -70,11 +183,24 @@ class GoogleAuthProvider:
         data = res.json()
         self._access_token = data["access_token"]
         self._refresh_token = data.get("refresh_token", "")
+        self._id_token = data.get("id_token", "")
         return self._access_token
 
-    def get_user_info(self) -> GoogleProviderUserInfo:
-        res = requests.get(
-            "https://www.googleapis.com/oauth2/v2/userinfo",
+    async def get_user_info(self) -> GoogleProviderUserInfo:
+        # 토큰 응답에 ID 토큰이 있으면 userinfo 를 호출하지 않고 직접 확인합니다.
+        if self._id_token:
+            claims = await verify_google_id_token(self._client, self._id_token)
+            return GoogleProviderUserInfo(
+                uid=claims["sub"],
+                email=claims.get("email", ""),
+                name=claims.get("name", ""),
+                picture=claims.get("picture", ""),
+                access_token=self._access_token,
+                refresh_token=self._refresh_token,
+            )
+
+        res = await self._client.get(
+            GOOGLE_USER_INFO_URL,
             headers={"Authorization": f"Bearer {self._access_token}"},
         )
         if res.status_code != 200:
@@ -0,0 +1,85 @@
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+from dateutil import rrule
+
+from app.enum import CalendarRecurringFrequencyEnum
+
+FREQUENCY_MAP = {
+    CalendarRecurringFrequencyEnum.DAY: rrule.DAILY,
+    CalendarRecurringFrequencyEnum.WEEK: rrule.WEEKLY,
+    CalendarRecurringFrequencyEnum.MONTH: rrule.MONTHLY,
+    CalendarRecurringFrequencyEnum.YEAR: rrule.YEARLY,
+}
+
+
+def utc_offset(dt: datetime) -> int:
+    """일시의 UTC 오프셋을 초 단위로 반환합니다."""
+    offset = dt.utcoffset()
+    return int(offset.total_seconds()) if offset is not None else 0
+
+
+def compile_rrule(
+    frequency: str,
+    interval: int,
+    dtstart: datetime,
+    until: datetime,
+    utc_offset: int | None = None,
+) -> rrule.rrule:
+    """반복 규칙을 생성합니다. 같은 반복 설정은 캐시된 규칙을 재사용합니다.
+
+    월, 년 단위 반복은 날짜를 기준으로 하므로 반복 일정을 만든 타임존에서
+    계산해야 합니다. utc_offset(초)이 주어지면 dtstart 를 그 타임존으로 바꿉니다.
+    """
+    if utc_offset is not None:
+        dtstart = dtstart.astimezone(timezone(timedelta(seconds=utc_offset)))
+    # 같은 시각이라도 타임존이 다르면 다른 규칙이므로 오프셋을 키에 포함합니다.
+    return _compile_rrule(frequency, interval, dtstart, until, dtstart.utcoffset())
+
+
+@lru_cache(maxsize=1024)
+def _compile_rrule(
+    frequency: str,
+    interval: int,
+    dtstart: datetime,
+    until: datetime,
+    offset: timedelta | None,
+) -> rrule.rrule:
+    return rrule.rrule(
+        freq=FREQUENCY_MAP[CalendarRecurringFrequencyEnum(frequency)],
+        interval=interval,
+        dtstart=dtstart,
+        until=until,
+    )
+
+
+def occurrences(
+    frequency: str,
+    interval: int,
+    dtstart: datetime,
+    until: datetime,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    utc_offset: int | None = None,
+) -> Iterator[datetime]:
+    """[start, end) 기간에 해당하는 반복 일시를 순서대로 반환합니다.
+
+    Args:
+        frequency: 반복 주기
+        interval: 반복 간격
+        dtstart: 반복 시작일시
+        until: 반복 종료일시
+        start: 조회 시작일시(기본값: 처음부터)
+        end: 조회 종료일시, 미포함(기본값: 끝까지)
+        utc_offset: 반복 일정을 만든 타임존의 UTC 오프셋(초, 기본값: dtstart 기준)
+
+    Returns:
+        반복 일시 이터레이터
+    """
+    r = compile_rrule(frequency, interval, dtstart, until, utc_offset)
+    it = r.xafter(start, inc=True) if start is not None else iter(r)
+    for dt in it:
+        if end is not None and dt >= end:
+            return
+        yield dt
@@ -1,38 +1,85 @@
+from collections.abc import Awaitable, Callable
+import hmac
+
 from app.repositories.calendar import CalendarRepository
 from app.services.calendar import CalendarService
 from app.services.contact import ContactService
-from fastapi import Cookie, Depends, Request
+import jwt
+from fastapi import Cookie, Depends, Header, Request, Response
 
-from app.base.auth import decode_token
+from app.base.auth import decode_token, refresh_access_token
+from app.base.config import config
+from app.base.db import DB, db
+from app.base.provider import OAuthClient
 from app.repositories.contact import ContactRepository
 from app.repositories.user import UserRepository
-from app.schemas import UserProfile
-from app.services.user import UserService
+from app.services.user import LoginService, UserService
 from app.exceptions import NotFoundError, PermissionError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
-def session(request: Request) -> AsyncSession:
-    return request.state.session
+async def session(request: Request) -> AsyncSession:
+    return await request.state.session.get()
+
+
+def database() -> DB:
+    return db
+
+
+def oauth_client(request: Request) -> OAuthClient:
+    return request.app.state.oauth_client
+
+
+def metrics_access(authorization: str = Header("")) -> None:
+    """내부 모니터링용 라우트는 metrics_token 을 가진 요청만 허용합니다."""
+    if not config.metrics_token:
+        raise NotFoundError()
+    expected = f"Bearer {config.metrics_token}".encode()
+    if not hmac.compare_digest(authorization.encode(), expected):
+        raise PermissionError()
+
+
+def writable(request: Request) -> None:
+    """GET 요청에서 데이터를 변경해야 할 때 라우트의 dependencies 에 추가합니다."""
+    request.state.session.allow_write()
 
 
-async def current_user(
-    session: AsyncSession = Depends(session),
+def statement_timeout(timeout: int) -> Callable[[Request], Awaitable[None]]:
+    """라우트의 쿼리 제한 시간(밀리초)을 정합니다. (라우트의 dependencies 에 추가)"""
+
+    async def dependency(request: Request) -> None:
+        await request.state.session.set_statement_timeout(timeout)
+
+    return dependency
+
+
+async def current_user_id(
+    request: Request,
+    response: Response,
     access_token: str = Cookie(default=None),
     refresh_token: str = Cookie(default=None),
-) -> UserProfile:
+) -> int:
+    """토큰의 유저 아이디를 반환합니다. (access token 이 유효하면 조회하지 않습니다)
+
+    access token 이 만료되었다면 refresh token 과 유저가 남아있는지 확인하고
+    access token 을 다시 발급하므로, 다음 요청부터는 access token 만 확인합니다.
+    """
     if access_token and refresh_token:
         try:
             result = decode_token(access_token)
-        except Exception:
-            result = decode_token(refresh_token)
-
-        user_repo = UserRepository(session)
-        user = await user_repo.get(result["user_id"])
-        if user:
-            return user.profile
-
-        raise NotFoundError(f"{result['user_id']} 유저는 존재하지 않습니다.")
+        except jwt.InvalidTokenError:
+            try:
+                result = decode_token(refresh_token)
+            except jwt.InvalidTokenError:
+                raise PermissionError("토큰이 유효하지 않습니다.")
+            # 세션은 재발급할 때만 만듭니다. (캐시된 프로필이 있으면 조회하지 않습니다)
+            user_service = UserService(UserRepository(await session(request)))
+            try:
+                await user_service.get(result["user_id"])
+            except NotFoundError:
+                raise PermissionError("유저가 존재하지 않습니다.")
+            refresh_access_token(response, result["user_id"])
+        return result["user_id"]
     else:
         raise PermissionError(
             f"{access_token=}, {refresh_token=} 토큰이 유효하지 않습니다."
@@ -47,6 +94,11 @@ def user_service(user_repo: UserRepository = Depends(user_repo)) -> UserService:
     return UserService(user_repo)
 
 
+def login_service(db: DB = Depends(database)) -> LoginService:
+    # 로그인은 별도의 세션에서 처리하므로 요청 세션을 만들지 않습니다.
+    return LoginService(db)
+
+
 def contact_repo(session: AsyncSession = Depends(session)) -> ContactRepository:
     return ContactRepository(session)
 
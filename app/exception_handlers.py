@@ -1,15 +1,25 @@
 from fastapi.applications import FastAPI
 from fastapi.responses import ORJSONResponse
+from sqlalchemy.exc import DBAPIError
 from starlette.requests import Request
 
-
-from app.exceptions import NotFoundError, PermissionError, ValidationError
+from app.base.db import db
+from app.exceptions import (
+    NotFoundError,
+    PermissionError,
+    ServiceUnavailableError,
+    ValidationError,
+)
 
 
 def add_exception_handlers(app: FastAPI) -> None:
     app.add_exception_handler(PermissionError, permission_error_handler)
     app.add_exception_handler(ValidationError, validation_error_handler)
     app.add_exception_handler(NotFoundError, notfound_error_handler)
+    app.add_exception_handler(
+        ServiceUnavailableError, service_unavailable_error_handler
+    )
+    app.add_exception_handler(DBAPIError, db_error_handler)
 
 
 def permission_error_handler(request: Request, exc: PermissionError) -> ORJSONResponse:
@@ -31,3 +41,30 @@ def validation_error_handler(request: Request, exc: ValidationError) -> ORJSONRe
         status_code=409,
         content={"message": str(exc)},
     )
+
+
+def service_unavailable_error_handler(
+    request: Request, exc: ServiceUnavailableError
+) -> ORJSONResponse:
+    return ORJSONResponse(
+        status_code=503,
+        content={"message": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+# statement_timeout 으로 쿼리가 취소되었을 때의 SQLSTATE (query_canceled)
+QUERY_CANCELED = "57014"
+
+
+async def db_error_handler(request: Request, exc: DBAPIError) -> ORJSONResponse:
+    if getattr(exc.orig, "sqlstate", None) != QUERY_CANCELED:
+        raise exc
+
+    route = request.scope.get("route")
+    db.statement_timeouts[getattr(route, "path", request.url.path)] += 1
+    await request.state.session.rollback()
+    return ORJSONResponse(
+        status_code=504,
+        content={"message": "요청 처리 시간이 초과되었습니다."},
+    )
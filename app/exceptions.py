@@ -15,3 +15,14 @@ class ValidationError(AppException):
 class NotFoundError(AppException):
     def __init__(self, msg: str = "존재하지 않습니다.") -> None:
         super().__init__(msg)
+
+
+class ReadOnlyError(AppException):
+    def __init__(self, msg: str = "읽기 전용 요청입니다.") -> None:
+        super().__init__(msg)
+
+
+class ServiceUnavailableError(AppException):
+    def __init__(self, msg: str = "요청이 많습니다.", retry_after: int = 1) -> None:
+        super().__init__(msg)
+        self.retry_after = retry_after
@@ -1,12 +1,17 @@
-from typing import Awaitable, Callable
-from fastapi import FastAPI, Request, Response
+import asyncio
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse
+from app.base.auth import token_cache
+from app.base.config import config
 from app.base.db import db
+from app.base.pagination import NEXT_CURSOR_HEADER
+from app.base.provider import OAuthClient
+from app import deps
 
 from app.exception_handlers import add_exception_handlers
-
-NO_DB_ROUTES = {"/ping", "/openapi.json", "/docs", "/redoc"}
+from app.middlewares import DBSessionMiddleware
+from app.services.user import profile_cache
 
 
 def init_views(app: FastAPI) -> None:
@@ -16,6 +21,20 @@ def init_views(app: FastAPI) -> None:
     def ping() -> str:
         return "pong"
 
+    @app.get(
+        "/metrics",
+        include_in_schema=False,
+        dependencies=[Depends(deps.metrics_access)],
+    )
+    def metrics() -> dict:
+        return {
+            "db_pools": db.pool_stats(),
+            "db_admission": db.admission.stats(),
+            "db_statement_timeouts": db.statement_timeouts,
+            "token_cache": token_cache.stats(),
+            "user_profile_cache": profile_cache.stats(),
+        }
+
     app.include_router(v1_router, prefix="/v1")
 
 
@@ -27,6 +46,7 @@ def create_app() -> FastAPI:
         default_response_class=ORJSONResponse,
     )
 
+    app.add_middleware(DBSessionMiddleware, db=db)
     app.add_middleware(
         CORSMiddleware,
         allow_credentials=True,
@@ -38,34 +58,32 @@ def create_app() -> FastAPI:
         ],
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
-    @app.middleware("http")
-    async def db_session_middleware(
-        request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        """request마다 session을 유지하기 위해 사용"""
-        if request.url.path in NO_DB_ROUTES:
-            return await call_next(request)
-
-        response = Response("Internal server error", status_code=500)
-        async with db.session() as session:
-            request.state.session = session
-            response = await call_next(request)
-        return response
-
     add_exception_handlers(app)
     init_views(app)
 
     @app.on_event("startup")
     async def startup() -> None:
         """서버 실행시 이벤트를 넣어주세요."""
-        pass
+        from app.workers import extend_recurring_calendars
+
+        app.state.oauth_client = OAuthClient(
+            config.oauth_timeout, config.oauth_retries, config.oauth_pool_size
+        )
+        app.state.workers = []
+        if config.calendar_recurring_horizon_days is not None:
+            app.state.workers.append(asyncio.create_task(extend_recurring_calendars()))
 
     @app.on_event("shutdown")
     async def shutdown() -> None:
         """서버 종료시 이벤트를 넣어주세요."""
-        pass
+        for worker in app.state.workers:
+            worker.cancel()
+        await asyncio.gather(*app.state.workers, return_exceptions=True)
+        await app.state.oauth_client.aclose()
+        await db.dispose()
 
     return app
 
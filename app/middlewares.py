@@ -0,0 +1,35 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.base.db import DB, LazySession
+
+
+# 읽기 전용 트랜잭션으로 처리하는 요청 메소드 (deps.writable 로 예외 처리)
+READONLY_METHODS = {"GET", "HEAD"}
+
+
+class DBSessionMiddleware:
+    """request마다 session을 유지하기 위해 사용 (session은 처음 사용할 때 생성)
+
+    BaseHTTPMiddleware 를 거치지 않는 ASGI 미들웨어입니다. 응답을 보내기 직전에
+    commit 하므로 클라이언트는 항상 commit 된 결과를 받습니다.
+    """
+
+    def __init__(self, app: ASGIApp, db: DB) -> None:
+        self.app = app
+        self.db = db
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        readonly = scope["method"] in READONLY_METHODS
+        async with LazySession(self.db, readonly) as session:
+            scope.setdefault("state", {})["session"] = session
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    await session.close()
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 
+from typing import Any
+
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from datetime import datetime
@@ -16,7 +19,7 @@ class User(TimestampBase):
     id: Mapped[int] = mapped_column(
         primary_key=True, nullable=False, autoincrement=True
     )
-    uid: Mapped[str] = mapped_column(sa.String(128), nullable=False, unique=True)
+    uid: Mapped[str] = mapped_column(sa.String(128), nullable=False)
     provider: Mapped[str] = mapped_column(sa.String(128), nullable=False)
     name: Mapped[str] = mapped_column(sa.String(100), nullable=False)
     email: Mapped[str] = mapped_column(
@@ -32,6 +35,16 @@ class User(TimestampBase):
         sa.Text, nullable=False, server_default=""
     )
 
+    __table_args__ = (
+        # 탈퇴한 유저는 같은 uid 로 다시 가입할 수 있습니다.
+        sa.Index(
+            "user_uid_uq",
+            uid,
+            unique=True,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        ),
+    )
+
     # relationship
     contacts: Mapped[set[Contact]] = relationship(
         back_populates="user", collection_class=set
@@ -74,7 +87,16 @@ class Contact(TimestampBase):
     )
     user_id: Mapped[int] = mapped_column(sa.ForeignKey("user.id"), nullable=False)
 
-    __table_args__ = (sa.Index("contact_user_id_idx", user_id, unique=False),)
+    __table_args__ = (
+        sa.Index(
+            "contact_user_id_updated_at_id_idx",
+            user_id,
+            sa.text("updated_at DESC"),
+            sa.text("id DESC"),
+            unique=False,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        ),
+    )
 
     # relationship
     user: Mapped[User] = relationship("User", back_populates="contacts")
@@ -120,14 +142,66 @@ class Calendar(TimestampBase):
     calendar_recurring_id: Mapped[uuid.UUID] = mapped_column(
         sa.ForeignKey("calendar_recurring.id"), nullable=True, default=None
     )
+    is_virtual: Mapped[bool] = mapped_column(
+        sa.Boolean, nullable=False, default=False, server_default=sa.false()
+    )  # 조회시 펼쳐지는 반복 일정의 원본 여부
+    recurrence_dt: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True), nullable=True, default=None
+    )  # 반복 일정에서 개별 수정된 일정의 원래 시작일시
     contact_id: Mapped[uuid.UUID] = mapped_column(
         sa.ForeignKey("contact.id"), nullable=False
     )
+    user_id: Mapped[int] = mapped_column(
+        sa.ForeignKey("user.id"), nullable=False
+    )  # 유저별 조회시 contact 조인을 피하기 위해 함께 저장
 
-    __table_args__ = (sa.Index("calendar_contact_id_idx", contact_id, unique=False),)
+    __table_args__ = (
+        sa.Index(
+            "calendar_contact_id_start_dt_id_idx",
+            contact_id,
+            start_dt,
+            id,
+            unique=False,
+        ),
+        sa.Index(
+            "calendar_user_id_start_dt_id_idx",
+            user_id,
+            start_dt,
+            id,
+            unique=False,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        ),
+        sa.Index(
+            "calendar_virtual_contact_id_idx",
+            contact_id,
+            unique=False,
+            postgresql_where=sa.text("is_virtual IS true AND deleted_at IS NULL"),
+        ),
+        sa.Index(
+            "calendar_virtual_user_id_idx",
+            user_id,
+            unique=False,
+            postgresql_where=sa.text("is_virtual IS true AND deleted_at IS NULL"),
+        ),
+        sa.Index(
+            "calendar_calendar_recurring_id_start_dt_idx",
+            calendar_recurring_id,
+            start_dt,
+            unique=False,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        ),
+        sa.Index(
+            "calendar_recurrence_uq",
+            calendar_recurring_id,
+            recurrence_dt,
+            unique=True,
+            postgresql_where=recurrence_dt.isnot(None),
+        ),
+    )
 
     # relationship
     contact = relationship("Contact", back_populates="calendars")
+    calendar_recurring: Mapped[CalendarRecurring] = relationship("CalendarRecurring")
     calendar_contacts: Mapped[set[CalendarContact]] = relationship(
         "CalendarContact",
         back_populates="calendar",
@@ -147,10 +221,30 @@ class CalendarRecurring(TimestampBase):
     end_dt: Mapped[datetime] = mapped_column(sa.DateTime(timezone=True), nullable=False)
     interval: Mapped[int] = mapped_column(sa.Integer, nullable=False)
     frequency: Mapped[str] = mapped_column(sa.String(100), nullable=False)
+    utc_offset: Mapped[int] = mapped_column(
+        sa.Integer, nullable=False, default=0, server_default="0"
+    )  # 반복 일정을 만든 타임존의 UTC 오프셋 (초 단위), 이 타임존 기준으로 반복
+    materialized_until: Mapped[datetime | None] = mapped_column(
+        sa.DateTime(timezone=True), nullable=True, default=None
+    )  # 이 일시 이전의 일정까지 생성됨 (null 이면 모두 생성됨)
+    contact_id: Mapped[uuid.UUID | None] = mapped_column(
+        sa.ForeignKey("contact.id"), nullable=True, default=None
+    )
+    template: Mapped[dict[str, Any] | None] = mapped_column(
+        postgresql.JSONB, nullable=True, default=None
+    )  # 이어서 생성할 일정의 내용 (CalendarInput)
     user_id: Mapped[int] = mapped_column(sa.ForeignKey("user.id"), nullable=False)
 
     __table_args__ = (
         sa.Index("calendar_recurring_user_id_idx", user_id, unique=False),
+        sa.Index(
+            "calendar_recurring_materialized_until_idx",
+            materialized_until,
+            unique=False,
+            postgresql_where=sa.text(
+                "materialized_until IS NOT NULL AND deleted_at IS NULL"
+            ),
+        ),
     )
 
 
@@ -167,6 +261,10 @@ class CalendarContact(TimestampBase):
         sa.ForeignKey("contact.id"), nullable=False
     )
 
+    __table_args__ = (
+        sa.Index("calendar_contact_calendar_id_idx", calendar_id, unique=False),
+    )
+
     # relationship
     contact: Mapped[Contact] = relationship(
         "Contact", back_populates="calendar_contacts"
@@ -1,21 +1,28 @@
+from collections.abc import Iterator
 from datetime import datetime
-from uuid import UUID
+import heapq
+import itertools
+from typing import Any
+from uuid import UUID, uuid4
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import orm
+from app.base import recurrence
+from app.base.config import config
 from app.exceptions import NotFoundError
 from app.schemas import CalendarInput
 from app.utils import tz_now
-from sqlalchemy.orm import subqueryload
+from sqlalchemy.orm import contains_eager, joinedload, subqueryload
 
 
 class CalendarRepository:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
-    async def get(self, calendar_id: UUID) -> orm.Calendar:
-        """일정을 조회합니다."""
+    async def get(self, calendar_id: UUID) -> orm.Calendar | None:
+        """일정과 연결된 연락처를 조회합니다."""
         query = (
             sa.select(orm.Calendar)
             .options(
@@ -33,73 +40,344 @@ class CalendarRepository:
         return res.scalar()
 
     async def fetch(
-        self, contact_id: UUID, offset: int, limit: int
+        self,
+        contact_id: UUID,
+        offset: int,
+        limit: int,
+        after: tuple[datetime, UUID] | None = None,
     ) -> list[orm.Calendar]:
-        query = (
-            sa.select(orm.Calendar)
-            .where(
-                sa.and_(
-                    orm.Calendar.contact_id == contact_id,
-                    orm.Calendar.deleted_at.is_(None),
-                )
+        """시작일시 순으로 연락처의 일정을 조회합니다.
+
+        after 가 주어지면 (start_dt, id) 가 그보다 뒤인 일정부터 조회합니다.
+        """
+        query = sa.select(orm.Calendar).where(
+            sa.and_(
+                orm.Calendar.contact_id == contact_id,
+                orm.Calendar.deleted_at.is_(None),
+                orm.Calendar.is_virtual.is_(False),
             )
-            .offset(offset)
-            .limit(limit)
-            .order_by(orm.Calendar.start_dt.asc())
         )
-        res = await self._session.execute(query)
-        return list(res.scalars())
+        if after is not None:
+            query = query.where(
+                sa.tuple_(orm.Calendar.start_dt, orm.Calendar.id) > after
+            )
+        query = query.order_by(orm.Calendar.start_dt.asc(), orm.Calendar.id.asc())
+
+        masters = await self._fetch_virtual_masters(
+            sa.select(orm.Calendar).where(orm.Calendar.contact_id == contact_id)
+        )
+        if not masters:
+            res = await self._session.execute(query.offset(offset).limit(limit))
+            return list(res.scalars())
+
+        # 가상 반복 일정과 합쳐서 잘라내야 하므로 offset 없이 필요한 만큼 가져옵니다.
+        res = await self._session.execute(query.limit(offset + limit))
+        return await self._merge_occurrences(
+            list(res.scalars()), masters, offset, limit, after=after
+        )
 
     async def fetch_user_calendars(
-        self, user_id: int, year: int | None, month: int | None, offset: int, limit: int
+        self,
+        user_id: int,
+        start: datetime | None,
+        end: datetime | None,
+        offset: int,
+        limit: int,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> list[orm.Calendar]:
+        """[start, end) 기간에 시작하는 유저의 일정을 조회합니다.
+
+        after 가 주어지면 (start_dt, id) 가 그보다 뒤인 일정부터 조회합니다.
+        """
+        query = sa.select(orm.Calendar).where(
+            sa.and_(
+                orm.Calendar.user_id == user_id,
+                orm.Calendar.deleted_at.is_(None),
+                orm.Calendar.is_virtual.is_(False),
+            )
+        )
+        if start is not None:
+            query = query.where(orm.Calendar.start_dt >= start)
+        if end is not None:
+            query = query.where(orm.Calendar.start_dt < end)
+        if after is not None:
+            query = query.where(
+                sa.tuple_(orm.Calendar.start_dt, orm.Calendar.id) > after
+            )
+        query = query.order_by(orm.Calendar.start_dt.asc(), orm.Calendar.id.asc())
+
+        masters = await self._fetch_virtual_masters(
+            sa.select(orm.Calendar).where(orm.Calendar.user_id == user_id),
+            start,
+            end,
+        )
+        if not masters:
+            res = await self._session.execute(query.offset(offset).limit(limit))
+            return list(res.scalars())
+
+        res = await self._session.execute(query.limit(offset + limit))
+        return await self._merge_occurrences(
+            list(res.scalars()), masters, offset, limit, start, end, after
+        )
+
+    async def _fetch_virtual_masters(
+        self,
+        query: sa.Select[tuple[orm.Calendar]],
+        start: datetime | None = None,
+        end: datetime | None = None,
     ) -> list[orm.Calendar]:
+        """기간과 겹치는 가상 반복 일정의 원본을 조회합니다."""
+        if not config.calendar_recurring_virtual:
+            # 가상 반복 일정을 쓰지 않으면 원본이 없으므로 조회하지 않습니다.
+            return []
         query = (
-            sa.select(orm.Calendar)
-            .join(orm.Contact)
+            query.join(orm.Calendar.calendar_recurring)
+            .options(contains_eager(orm.Calendar.calendar_recurring))
             .where(
                 sa.and_(
-                    orm.Contact.user_id == user_id,
+                    orm.Calendar.is_virtual.is_(True),
                     orm.Calendar.deleted_at.is_(None),
                 )
             )
         )
+        if end is not None:
+            query = query.where(orm.Calendar.start_dt < end)
+        if start is not None:
+            query = query.where(orm.CalendarRecurring.end_dt >= start)
 
-        # year가 None인 경우, 올해 연도로 설정
-        if year is None:
-            year = datetime.now().year
-
-        query = query.where(sa.extract("year", orm.Calendar.start_dt) == year)
+        res = await self._session.execute(query)
+        return list(res.scalars())
 
-        # month가 주어진 경우, 쿼리에 추가
-        if month is not None:
-            query = query.where(sa.extract("month", orm.Calendar.start_dt) == month)
+    async def _merge_occurrences(
+        self,
+        calendars: list[orm.Calendar],
+        masters: list[orm.Calendar],
+        offset: int,
+        limit: int,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> list[orm.Calendar]:
+        """저장된 일정과 가상 반복 일정을 (시작일시, 아이디) 순으로 합쳐 반환합니다."""
+        if after is not None and (start is None or start < after[0]):
+            start = after[0]
 
-        query = query.offset(offset).limit(limit).order_by(orm.Calendar.start_dt.asc())
+        # 개별 수정(삭제 포함)된 반복 일정은 펼치지 않습니다.
+        query = sa.select(
+            orm.Calendar.calendar_recurring_id, orm.Calendar.recurrence_dt
+        ).where(
+            sa.and_(
+                orm.Calendar.calendar_recurring_id.in_(
+                    [master.calendar_recurring_id for master in masters]
+                ),
+                orm.Calendar.recurrence_dt.isnot(None),
+            )
+        )
+        if start is not None:
+            query = query.where(orm.Calendar.recurrence_dt >= start)
+        if end is not None:
+            query = query.where(orm.Calendar.recurrence_dt < end)
         res = await self._session.execute(query)
-        return list(res.scalars())
+        exceptions = {(row[0], row[1]) for row in res}
+
+        merged = heapq.merge(
+            calendars,
+            *[
+                (
+                    calendar
+                    for calendar in self._expand(master, start, end)
+                    if (master.calendar_recurring_id, calendar.start_dt)
+                    not in exceptions
+                    and (after is None or (calendar.start_dt, calendar.id) > after)
+                )
+                for master in masters
+            ],
+            key=lambda calendar: (calendar.start_dt, calendar.id),
+        )
+        return list(itertools.islice(merged, offset, offset + limit))
+
+    def _expand(
+        self,
+        master: orm.Calendar,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> Iterator[orm.Calendar]:
+        """가상 반복 일정의 원본을 기간 안의 일정들로 펼칩니다."""
+        recurring = master.calendar_recurring
+        for dt in recurrence.occurrences(
+            recurring.frequency,
+            recurring.interval,
+            master.start_dt,
+            recurring.end_dt,
+            start,
+            end,
+            recurring.utc_offset,
+        ):
+            # 저장된 일정과 같은 타임존으로 반환합니다.
+            dt = dt.astimezone(master.start_dt.tzinfo)
+            yield orm.Calendar(**self._occurrence_values(master, dt))
+
+    def _occurrence_values(self, master: orm.Calendar, dt: datetime) -> dict[str, Any]:
+        values = {
+            attr.key: getattr(master, attr.key)
+            for attr in sa.inspect(orm.Calendar).column_attrs
+        }
+        values["start_dt"] = dt
+        if master.end_dt is not None:
+            values["end_dt"] = dt + (master.end_dt - master.start_dt)
+        return values
 
     async def create(self, contact_id: UUID, calendar: orm.Calendar) -> orm.Calendar:
+        """일정을 추가합니다. INSERT 는 commit 시점에 함께 실행됩니다."""
         self._session.add(calendar)
-        await self._session.flush()
-
-        calendar_contact = orm.CalendarContact(
-            contact_id=contact_id, calendar_id=calendar.id
+        self._session.add(
+            orm.CalendarContact(contact_id=contact_id, calendar_id=calendar.id)
         )
-        self._session.add(calendar_contact)
-        await self._session.flush()
         return calendar
 
+    async def bulk_create(
+        self, contact_id: UUID, values: list[dict[str, Any]]
+    ) -> list[orm.Calendar]:
+        """반복 일정처럼 여러 일정을 한번에 생성합니다.
+
+        일정과 연락처 연결을 각각 multi-row INSERT 로 저장하므로 일정 개수와 관계없이
+        왕복 횟수가 일정하게 유지됩니다.
+        """
+        if not values:
+            return []
+
+        # 먼저 추가된 반복 설정 등을 참조하므로 대기중인 객체를 함께 반영합니다.
+        await self._session.flush()
+        res = await self._session.scalars(
+            sa.insert(orm.Calendar).returning(
+                orm.Calendar, sort_by_parameter_order=True
+            ),
+            values,
+        )
+        calendars = list(res)
+        await self._session.execute(
+            sa.insert(orm.CalendarContact),
+            [
+                {"contact_id": contact_id, "calendar_id": calendar.id}
+                for calendar in calendars
+            ],
+        )
+        return calendars
+
     async def create_recurring(
         self, recurring: orm.CalendarRecurring
     ) -> orm.CalendarRecurring:
         self._session.add(recurring)
-        await self._session.flush()
-
         return recurring
 
+    async def claim_recurrings(
+        self, horizon: datetime, limit: int
+    ) -> list[orm.CalendarRecurring]:
+        """이어서 생성해야 하는 반복 일정을 잠그고 가져옵니다.
+
+        다른 프로세스가 잠근 반복 일정은 건너뛰므로 여러 워커가 나눠서 처리합니다.
+        """
+        query = (
+            sa.select(orm.CalendarRecurring)
+            .where(
+                sa.and_(
+                    orm.CalendarRecurring.materialized_until < horizon,
+                    orm.CalendarRecurring.deleted_at.is_(None),
+                )
+            )
+            .order_by(orm.CalendarRecurring.materialized_until.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        res = await self._session.execute(query)
+        return list(res.scalars())
+
+    async def fetch_live_recurring_ids(self, recurring_ids: list[UUID]) -> set[UUID]:
+        """삭제되지 않은 일정이 남아 있는 반복 일정의 아이디를 가져옵니다."""
+        query = (
+            sa.select(orm.Calendar.calendar_recurring_id)
+            .where(
+                sa.and_(
+                    orm.Calendar.calendar_recurring_id.in_(recurring_ids),
+                    orm.Calendar.deleted_at.is_(None),
+                )
+            )
+            .distinct()
+        )
+        res = await self._session.scalars(query)
+        return set(res)
+
+    async def materialize_occurrence(
+        self, calendar_id: UUID, occurrence_dt: datetime
+    ) -> orm.Calendar:
+        """가상 반복 일정의 특정 일정을 개별 수정할 수 있도록 저장합니다."""
+        query = (
+            sa.select(orm.Calendar)
+            .options(joinedload(orm.Calendar.calendar_recurring))
+            .where(
+                sa.and_(
+                    orm.Calendar.id == calendar_id,
+                    orm.Calendar.is_virtual.is_(True),
+                    orm.Calendar.deleted_at.is_(None),
+                )
+            )
+        )
+        res = await self._session.execute(query)
+        master = res.scalar_one_or_none()
+        if not master:
+            raise NotFoundError("존재하지 않는 반복 일정입니다.")
+
+        recurring = master.calendar_recurring
+        r = recurrence.compile_rrule(
+            recurring.frequency,
+            recurring.interval,
+            master.start_dt,
+            recurring.end_dt,
+            recurring.utc_offset,
+        )
+        if r.after(occurrence_dt, inc=True) != occurrence_dt:
+            raise NotFoundError("존재하지 않는 반복 일정입니다.")
+
+        values = self._occurrence_values(master, occurrence_dt)
+        del values["created_at"], values["updated_at"]
+        values.update(id=uuid4(), is_virtual=False, recurrence_dt=occurrence_dt)
+        res = await self._session.execute(
+            postgresql.insert(orm.Calendar)
+            .values(values)
+            .on_conflict_do_nothing(
+                index_elements=[
+                    orm.Calendar.calendar_recurring_id,
+                    orm.Calendar.recurrence_dt,
+                ],
+                index_where=orm.Calendar.recurrence_dt.isnot(None),
+            )
+            .returning(orm.Calendar.id)
+        )
+        if res.scalar() is not None:
+            self._session.add(
+                orm.CalendarContact(
+                    contact_id=master.contact_id, calendar_id=values["id"]
+                )
+            )
+
+        res = await self._session.execute(
+            sa.select(orm.Calendar).where(
+                sa.and_(
+                    orm.Calendar.calendar_recurring_id == master.calendar_recurring_id,
+                    orm.Calendar.recurrence_dt == occurrence_dt,
+                    orm.Calendar.deleted_at.is_(None),
+                )
+            )
+        )
+        calendar = res.scalar_one_or_none()
+        if not calendar:
+            raise NotFoundError("존재하지 않는 일정입니다.")
+        return calendar
+
     async def update(
         self, calendar_id: UUID, calendar_input: CalendarInput
-    ) -> orm.Calendar:
+    ) -> orm.Calendar | None:
+        """일정을 수정합니다. 수정할 일정이 없으면 None 을 반환합니다."""
         query = (
             sa.update(orm.Calendar)
             .where(
@@ -121,58 +399,69 @@ class CalendarRepository:
                 completed_at=calendar_input.completed_at,
                 tags=calendar_input.tags,
             )
+            .returning(orm.Calendar)
+            .execution_options(populate_existing=True)
         )
-        await self._session.execute(query)
-        await self._session.flush()
-        updated_calendar = await self._session.execute(
-            sa.select(orm.Calendar).where(
-                sa.and_(
-                    orm.Calendar.id == calendar_id, orm.Calendar.deleted_at.is_(None)
-                )
-            )
+        return await self._session.scalar(query)
+
+    async def update_calendar_completion(
+        self, calendar_id: UUID
+    ) -> orm.Calendar | None:
+        """완료 여부를 반전하고 완료일시를 함께 갱신합니다."""
+        return await self._toggle(
+            calendar_id,
+            is_complete=sa.not_(orm.Calendar.is_complete),
+            completed_at=sa.case((orm.Calendar.is_complete, None), else_=sa.func.now()),
+        )
+
+    async def update_calendar_importance(
+        self, calendar_id: UUID
+    ) -> orm.Calendar | None:
+        """중요 여부를 반전합니다."""
+        return await self._toggle(
+            calendar_id, is_important=sa.not_(orm.Calendar.is_important)
         )
-        return updated_calendar.scalar_one_or_none()
 
-    async def update_calendar_completion(self, calendar_id: UUID) -> orm.Calendar:
+    async def _toggle(
+        self, calendar_id: UUID, **values: sa.ColumnElement[Any]
+    ) -> orm.Calendar | None:
+        # 행 잠금을 파이썬 코드 실행 동안 잡고 있지 않도록 DB 에서 값을 바꿉니다.
         query = (
-            sa.select(orm.Calendar)
+            sa.update(orm.Calendar)
             .where(
                 sa.and_(
                     orm.Calendar.id == calendar_id,
                     orm.Calendar.deleted_at.is_(None),
                 )
             )
-            .with_for_update()
+            .values(**values)
+            .returning(orm.Calendar)
+            .execution_options(populate_existing=True)
         )
-        res = await self._session.execute(query)
-        calendar = res.scalar_one_or_none()
-        if not calendar:
-            raise NotFoundError("존재하지 않는 일정입니다.")
-        calendar.is_complete = not calendar.is_complete
-        return calendar
+        return await self._session.scalar(query)
 
-    async def update_calendar_importance(self, calendar_id: UUID) -> orm.Calendar:
-        query = (
-            sa.select(orm.Calendar)
+    async def delete(self, calendar_id: UUID) -> None:
+        # 가상 반복 일정의 원본을 삭제하면 개별 수정된 일정도 함께 삭제합니다.
+        virtual_recurring_id = (
+            sa.select(orm.Calendar.calendar_recurring_id)
             .where(
                 sa.and_(
-                    orm.Calendar.id == calendar_id,
-                    orm.Calendar.deleted_at.is_(None),
+                    orm.Calendar.id == calendar_id, orm.Calendar.is_virtual.is_(True)
                 )
             )
-            .with_for_update()
+            .scalar_subquery()
         )
-        res = await self._session.execute(query)
-        calendar = res.scalar_one_or_none()
-        if not calendar:
-            raise NotFoundError("존재하지 않는 일정입니다.")
-        calendar.is_important = not calendar.is_important
-        return calendar
-
-    async def delete(self, calendar_id: UUID) -> None:
         query = (
             sa.update(orm.Calendar)
-            .where(orm.Calendar.id == calendar_id)
+            .where(
+                sa.and_(
+                    sa.or_(
+                        orm.Calendar.id == calendar_id,
+                        orm.Calendar.calendar_recurring_id == virtual_recurring_id,
+                    ),
+                    orm.Calendar.deleted_at.is_(None),
+                )
+            )
             .values(deleted_at=tz_now())
         )
         await self._session.execute(query)
@@ -1,9 +1,9 @@
+from datetime import datetime
 from uuid import UUID
 import sqlalchemy as sa
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import orm
-from app.exceptions import NotFoundError
 from app.schemas import ContactInput
 from app.utils import tz_now
 from sqlalchemy.orm import selectinload
@@ -24,7 +24,17 @@ class ContactRepository:
         res = await self._session.execute(query)
         return res.scalar()
 
-    async def fetch(self, user_id: int, offset: int, limit: int) -> list[orm.Contact]:
+    async def fetch(
+        self,
+        user_id: int,
+        offset: int,
+        limit: int,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> list[orm.Contact]:
+        """최근 수정된 순으로 연락처를 조회합니다.
+
+        after 가 주어지면 (updated_at, id) 가 그보다 앞선 연락처부터 조회합니다.
+        """
         query = (
             sa.select(orm.Contact)
             .where(
@@ -34,19 +44,24 @@ class ContactRepository:
             )
             .offset(offset)
             .limit(limit)
-            .order_by(orm.Contact.updated_at.desc())
+            .order_by(orm.Contact.updated_at.desc(), orm.Contact.id.desc())
         )
+        if after is not None:
+            query = query.where(
+                sa.tuple_(orm.Contact.updated_at, orm.Contact.id) < after
+            )
         res = await self._session.execute(query)
         return list(res.scalars())
 
     async def create(self, contact: orm.Contact) -> orm.Contact:
+        """연락처를 추가합니다. INSERT 는 commit 시점에 실행됩니다."""
         self._session.add(contact)
-        await self._session.flush()
         return contact
 
     async def update(
         self, contact_id: UUID, contact_input: ContactInput
-    ) -> orm.Contact:
+    ) -> orm.Contact | None:
+        """연락처를 수정합니다. 수정할 연락처가 없으면 None 을 반환합니다."""
         query = (
             sa.update(orm.Contact)
             .where(
@@ -56,15 +71,10 @@ class ContactRepository:
                 )
             )
             .values(contact_input.model_dump())
+            .returning(orm.Contact)
+            .execution_options(populate_existing=True)
         )
-        await self._session.execute(query)
-        await self._session.flush()
-        updated_contact = await self._session.execute(
-            sa.select(orm.Contact).where(
-                sa.and_(orm.Contact.id == contact_id, orm.Contact.deleted_at.is_(None))
-            )
-        )
-        return updated_contact.scalar_one_or_none()
+        return await self._session.scalar(query)
 
     async def delete(self, contact_id: UUID) -> None:
         query = (
@@ -74,20 +84,18 @@ class ContactRepository:
         )
         await self._session.execute(query)
 
-    async def update_contact_importance(self, contact_id: UUID) -> orm.Contact:
+    async def update_contact_importance(self, contact_id: UUID) -> orm.Contact | None:
+        """중요 여부를 반전합니다."""
         query = (
-            sa.select(orm.Contact)
+            sa.update(orm.Contact)
             .where(
                 sa.and_(
                     orm.Contact.id == contact_id,
                     orm.Contact.deleted_at.is_(None),
                 )
             )
-            .with_for_update()
+            .values(is_important=sa.not_(orm.Contact.is_important))
+            .returning(orm.Contact)
+            .execution_options(populate_existing=True)
         )
-        res = await self._session.execute(query)
-        contact = res.scalar_one_or_none()
-        if not contact:
-            raise NotFoundError("존재하지 않는 연락처입니다.")
-        contact.is_important = not contact.is_important
-        return contact
+        return await self._session.scalar(query)
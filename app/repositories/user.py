@@ -1,4 +1,6 @@
+from typing import Any
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.orm import User
@@ -18,36 +20,63 @@ class UserRepository:
         return res.scalar()
 
     async def get_by_uid(self, uid: str) -> User:
-        query = sa.select(User).where(User.uid == uid)
+        query = sa.select(User).where(
+            sa.and_(User.uid == uid, User.deleted_at.is_(None))
+        )
         res = await self._session.execute(query)
         return res.scalar()
 
     async def fetch(self, offset: int, limit: int) -> list[User]:
         query = (
-            sa.select(User).where(User.deleted_at.is_(None)).offset(offset).limit(limit)
+            sa.select(User)
+            .where(User.deleted_at.is_(None))
+            .order_by(User.id.asc())
+            .offset(offset)
+            .limit(limit)
         )
         res = await self._session.execute(query)
         return list(res.scalars())
 
     async def create(self, user: User) -> User:
+        # id 를 DB 시퀀스에서 받아오므로 바로 반영합니다.
         self._session.add(user)
         await self._session.flush()
         return user
 
-    async def update(self, user_id: int, user_input: UserInput) -> User:
+    async def upsert(self, values: dict[str, Any]) -> User:
+        """uid 로 유저를 생성하거나, 이미 있으면 구글 토큰만 갱신합니다."""
+        insert = postgresql.insert(User).values(values)
+        excluded = insert.excluded
+        query = (
+            insert.on_conflict_do_update(
+                index_elements=[User.uid],
+                index_where=User.deleted_at.is_(None),
+                set_={
+                    User.google_access_token: excluded.google_access_token,
+                    # 구글은 처음 동의할 때만 refresh token 을 줍니다.
+                    User.google_refresh_token: sa.func.coalesce(
+                        sa.func.nullif(excluded.google_refresh_token, ""),
+                        User.google_refresh_token,
+                    ),
+                    User.updated_at: sa.func.now(),
+                },
+            )
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
+        res = await self._session.scalars(query)
+        return res.one()
+
+    async def update(self, user_id: int, user_input: UserInput) -> User | None:
+        """유저를 수정합니다. 수정할 유저가 없으면 None 을 반환합니다."""
         query = (
             sa.update(User)
             .where(sa.and_(User.id == user_id, User.deleted_at.is_(None)))
             .values(user_input.model_dump())
+            .returning(User)
+            .execution_options(populate_existing=True)
         )
-        await self._session.execute(query)
-        await self._session.flush()
-        updated_user = await self._session.execute(
-            sa.select(User).where(
-                sa.and_(User.id == user_id, User.deleted_at.is_(None))
-            )
-        )
-        return updated_user.scalar_one_or_none()
+        return await self._session.scalar(query)
 
     async def delete(self, user_id: int) -> None:
         query = sa.update(User).where(User.id == user_id).values(deleted_at=tz_now())
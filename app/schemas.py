@@ -278,6 +278,11 @@ class CalendarOutput(BaseModel):
         examples=[uuid.uuid4()],
         default=None,
     )
+    is_virtual: bool = Field(
+        description="가상 반복 일정 여부(수정시 start_dt 를 occurrence_dt 로 전달)",
+        examples=[False],
+        default=False,
+    )
     contact_id: uuid.UUID | None = Field(
         description="연락처 아이디",
         examples=[uuid.uuid4()],
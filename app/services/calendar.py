@@ -1,9 +1,15 @@
+from datetime import datetime, timedelta
+from typing import Any
 from uuid import UUID
+from sqlalchemy.exc import DBAPIError
 from app import schemas
-from app.exceptions import NotFoundError, ValidationError
+from app.base import recurrence
+from app.base.config import config
+from app.exceptions import NotFoundError, ServiceUnavailableError, ValidationError
 from app import orm
 from app.repositories.calendar import CalendarRepository
-from dateutil import rrule
+from app.base.pagination import decode_cursor, encode_cursor
+from app.utils import month_range, tz_now
 import logging
 
 # 로깅 설정 (출력 레벨은 DEBUG)
@@ -29,24 +35,61 @@ class CalendarService:
         )
 
     async def fetch(
-        self, contact_id: UUID, offset: int, limit: int
-    ) -> list[schemas.CalendarOutput]:
-        """복수 일정을 조회합니다."""
-        calendars = await self._calendar_repo.fetch(contact_id, offset, limit)
-        return [
-            schemas.CalendarOutput.model_validate(calendar) for calendar in calendars
-        ]
+        self, contact_id: UUID, offset: int, limit: int, cursor: str | None = None
+    ) -> tuple[list[schemas.CalendarOutput], str | None]:
+        """복수 일정을 조회합니다. 다음 페이지 커서를 함께 반환합니다."""
+        calendars = await self._calendar_repo.fetch(
+            contact_id, offset, limit, self._decode_cursor(cursor)
+        )
+        return self._page(calendars, limit)
 
     async def fetch_user_calendars(
-        self, user_id: int, year: int | None, month: int | None, offset: int, limit: int
-    ) -> list[schemas.CalendarOutput]:
-        """유저의 모든 일정을 조회합니다."""
+        self,
+        user_id: int,
+        year: int | None,
+        month: int | None,
+        offset: int,
+        limit: int,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        cursor: str | None = None,
+    ) -> tuple[list[schemas.CalendarOutput], str | None]:
+        """유저의 모든 일정을 조회합니다. 다음 페이지 커서를 함께 반환합니다.
+
+        start, end 가 주어지면 [start, end) 기간을, 아니라면 year, month 에 해당하는
+        기간을 조회합니다.
+        """
+        if start is None and end is None:
+            # year가 None인 경우, 올해 연도로 설정
+            if year is None:
+                year = tz_now().year
+            start, end = month_range(year, month)
+        elif any(dt is not None and dt.tzinfo is None for dt in (start, end)):
+            raise ValidationError("from, to 에 타임존 정보가 필요합니다.")
+
         calendars = await self._calendar_repo.fetch_user_calendars(
-            user_id, year, month, offset, limit
+            user_id, start, end, offset, limit, self._decode_cursor(cursor)
         )
+        return self._page(calendars, limit)
+
+    def _decode_cursor(self, cursor: str | None) -> tuple[datetime, UUID] | None:
+        if cursor is None:
+            return None
+        try:
+            return decode_cursor(cursor)
+        except ValueError:
+            raise ValidationError("유효하지 않은 커서입니다.")
+
+    def _page(
+        self, calendars: list[orm.Calendar], limit: int
+    ) -> tuple[list[schemas.CalendarOutput], str | None]:
+        """조회한 일정과 다음 페이지 커서를 반환합니다."""
+        next_cursor = None
+        if len(calendars) == limit:
+            next_cursor = encode_cursor(calendars[-1].start_dt, calendars[-1].id)
         return [
             schemas.CalendarOutput.model_validate(calendar) for calendar in calendars
-        ]
+        ], next_cursor
 
     async def create(
         self, user_id: int, contact_id: UUID, calendar_input: schemas.CalendarInput
@@ -57,49 +100,67 @@ class CalendarService:
                 raise ValidationError("반복 설정이 필요합니다.")
             try:
                 # 반복 주기와 간격을 기반으로 반복 일정을 생성합니다.
+                recurring_input = calendar_input.recurring_input
+                start_dt = max(recurring_input.start_dt, calendar_input.start_dt)
                 recurring = await self._calendar_repo.create_recurring(
                     orm.CalendarRecurring(
-                        **calendar_input.recurring_input.model_dump(), user_id=user_id
+                        **recurring_input.model_dump(exclude={"start_dt"}),
+                        # 워커가 이어서 생성할 수 있도록 실제 시작일시를 저장합니다.
+                        start_dt=start_dt,
+                        utc_offset=recurrence.utc_offset(start_dt),
+                        contact_id=contact_id,
+                        template=calendar_input.model_dump(
+                            mode="json", exclude={"recurring_input"}
+                        ),
+                        materialized_until=self._horizon(
+                            start_dt, recurring_input.end_dt
+                        ),
+                        user_id=user_id,
                     )
                 )
-                freq_map = {
-                    "일": rrule.DAILY,
-                    "주": rrule.WEEKLY,
-                    "월": rrule.MONTHLY,
-                    "년": rrule.YEARLY,
-                }
-                start_dt = max(recurring.start_dt, calendar_input.start_dt)
-
-                r = rrule.rrule(
-                    freq=freq_map[recurring.frequency],
-                    interval=recurring.interval,
-                    dtstart=start_dt,
-                    until=recurring.end_dt,
+
+                r = recurrence.compile_rrule(
+                    recurring.frequency, recurring.interval, start_dt, recurring.end_dt
                 )
 
-                calendars: list[orm.Calendar] = []
-                for dt in r:
+                if config.calendar_recurring_virtual:
+                    # 원본 일정 하나만 저장하고 조회할 때 펼칩니다.
+                    first_dt = next(iter(r), None)
+                    if first_dt is None:
+                        raise ValidationError("반복 일정이 존재하지 않습니다.")
+
                     calendar = orm.Calendar(
-                        start_dt=dt,
-                        name=calendar_input.name,
-                        end_dt=calendar_input.end_dt,
-                        content=calendar_input.content,
-                        is_all_day=calendar_input.is_all_day,
-                        is_repeat=calendar_input.is_repeat,
-                        is_complete=calendar_input.is_complete,
-                        is_important=calendar_input.is_important,
-                        remind_interval=calendar_input.remind_interval,
-                        completed_at=calendar_input.completed_at,
-                        tags=calendar_input.tags,
-                        contact_id=contact_id,
-                        calendar_recurring_id=recurring.id,
+                        **self._occurrence_values(
+                            calendar_input, first_dt, user_id, contact_id, recurring.id
+                        ),
+                        is_virtual=True,
                     )
                     result = await self._calendar_repo.create(contact_id, calendar)
-                    calendars.append(result)
+                    return schemas.CalendarOutput.model_validate(result)
+
+                # 반복 일정을 한번에 저장합니다. (생성 기한이 있다면 기한 전까지)
+                calendars = await self._calendar_repo.bulk_create(
+                    contact_id,
+                    [
+                        self._occurrence_values(
+                            calendar_input, dt, user_id, contact_id, recurring.id
+                        )
+                        for dt in recurrence.occurrences(
+                            recurring.frequency,
+                            recurring.interval,
+                            start_dt,
+                            recurring.end_dt,
+                            end=recurring.materialized_until,
+                        )
+                    ],
+                )
 
                 # 반복 일정을 생성했을 경우 첫번째 생성된 일정만 반환합니다.
                 return schemas.CalendarOutput.model_validate(calendars[0])
 
+            except (DBAPIError, ServiceUnavailableError):
+                # 쿼리 취소(504)나 DB 과부하(503)는 입력 오류가 아닙니다.
+                raise
             except Exception as e:
                 logging.debug(f"반복 설정 생성 실패 {e}")
                 raise ValidationError("반복 설정이 잘못되었습니다.")
@@ -116,6 +177,7 @@ class CalendarService:
                 remind_interval=calendar_input.remind_interval,
                 completed_at=calendar_input.completed_at,
                 tags=calendar_input.tags,
+                user_id=user_id,
                 contact_id=contact_id,
                 calendar_recurring_id=None,
             )
@@ -123,24 +185,126 @@ class CalendarService:
             result = await self._calendar_repo.create(contact_id, calendar)
             return schemas.CalendarOutput.model_validate(result)
 
+    async def extend_recurring_calendars(self, batch_size: int) -> int:
+        """미리 생성한 기한이 다가온 반복 일정을 이어서 생성합니다.
+
+        Returns:
+            처리한 반복 일정 수
+        """
+        if config.calendar_recurring_horizon_days is None:
+            return 0
+
+        # 생성 기한이 절반 이상 지난 반복 일정만 이어서 생성합니다.
+        now = tz_now()
+        recurrings = await self._calendar_repo.claim_recurrings(
+            now + timedelta(days=config.calendar_recurring_horizon_days / 2),
+            batch_size,
+        )
+        if not recurrings:
+            return 0
+
+        live_ids = await self._calendar_repo.fetch_live_recurring_ids(
+            [recurring.id for recurring in recurrings]
+        )
+        for recurring in recurrings:
+            materialized_until = self._horizon(now, recurring.end_dt)
+            # 남은 일정이 모두 삭제된 반복 일정은 더 이상 생성하지 않습니다.
+            if (
+                recurring.id not in live_ids
+                or recurring.contact_id is None
+                or recurring.template is None
+            ):
+                recurring.materialized_until = None
+                continue
+
+            # 개별 수정된 일정이 아닌 반복 일정을 만들 때의 내용으로 생성합니다.
+            source = schemas.CalendarInput.model_validate(recurring.template)
+            values = [
+                self._occurrence_values(
+                    source, dt, recurring.user_id, recurring.contact_id, recurring.id
+                )
+                for dt in recurrence.occurrences(
+                    recurring.frequency,
+                    recurring.interval,
+                    recurring.start_dt,
+                    recurring.end_dt,
+                    recurring.materialized_until,
+                    materialized_until,
+                    recurring.utc_offset,
+                )
+            ]
+            # 완료 여부는 이어서 생성하는 일정에 복사하지 않습니다.
+            for value in values:
+                value.update(is_complete=False, completed_at=None)
+            await self._calendar_repo.bulk_create(recurring.contact_id, values)
+            recurring.materialized_until = materialized_until
+
+        return len(recurrings)
+
+    def _horizon(self, start_dt: datetime, end_dt: datetime) -> datetime | None:
+        """반복 일정을 미리 생성할 기한을 반환합니다. (None 이면 종료일시까지 생성)"""
+        if (
+            config.calendar_recurring_virtual
+            or config.calendar_recurring_horizon_days is None
+        ):
+            return None
+
+        horizon = max(tz_now(), start_dt) + timedelta(
+            days=config.calendar_recurring_horizon_days
+        )
+        return horizon if horizon <= end_dt else None
+
+    def _occurrence_values(
+        self,
+        source: schemas.CalendarInput | orm.Calendar,
+        start_dt: datetime,
+        user_id: int,
+        contact_id: UUID,
+        calendar_recurring_id: UUID,
+    ) -> dict[str, Any]:
+        return dict(
+            start_dt=start_dt,
+            name=source.name,
+            end_dt=source.end_dt,
+            content=source.content,
+            is_all_day=source.is_all_day,
+            is_repeat=source.is_repeat,
+            is_complete=source.is_complete,
+            is_important=source.is_important,
+            remind_interval=source.remind_interval,
+            completed_at=source.completed_at,
+            tags=source.tags,
+            user_id=user_id,
+            contact_id=contact_id,
+            calendar_recurring_id=calendar_recurring_id,
+        )
+
     async def update(
-        self, calendar_id: UUID, calendar_input: schemas.CalendarInput
+        self,
+        calendar_id: UUID,
+        calendar_input: schemas.CalendarInput,
+        occurrence_dt: datetime | None = None,
     ) -> schemas.CalendarOutput:
         """일정을 수정합니다."""
+        calendar_id = await self._materialize(calendar_id, occurrence_dt)
         calendar = await self._calendar_repo.update(calendar_id, calendar_input)
         if calendar is None:
             raise NotFoundError("일정이 존재하지 않습니다.")
 
         return schemas.CalendarOutput.model_validate(calendar)
 
-    async def delete(self, calendar_id: UUID) -> None:
+    async def delete(
+        self, calendar_id: UUID, occurrence_dt: datetime | None = None
+    ) -> None:
         """일정을 삭제합니다."""
+        calendar_id = await self._materialize(calendar_id, occurrence_dt)
         await self._calendar_repo.delete(calendar_id)
 
     async def update_calendar_completion(
-        self, calendar_id: UUID
+        self, calendar_id: UUID, occurrence_dt: datetime | None = None
     ) -> schemas.CalendarOutput:
         """일정 완료 여부를 수정합니다."""
+        calendar_id = await self._materialize(calendar_id, occurrence_dt)
         calendar = await self._calendar_repo.update_calendar_completion(calendar_id)
         if calendar is None:
             raise NotFoundError("일정이 존재하지 않습니다.")
@@ -148,8 +312,26 @@ class CalendarService:
         return schemas.CalendarOutput.model_validate(calendar)
 
     async def update_calendar_importance(
-        self, calendar_id: UUID
+        self, calendar_id: UUID, occurrence_dt: datetime | None = None
     ) -> schemas.CalendarOutput:
         """일정 중요여부를 수정합니다."""
+        calendar_id = await self._materialize(calendar_id, occurrence_dt)
         calendar = await self._calendar_repo.update_calendar_importance(calendar_id)
+        if calendar is None:
+            raise NotFoundError("일정이 존재하지 않습니다.")
+
         return schemas.CalendarOutput.model_validate(calendar)
+
+    async def _materialize(
+        self, calendar_id: UUID, occurrence_dt: datetime | None
+    ) -> UUID:
+        """가상 반복 일정의 특정 일정을 개별 일정으로 저장하고 아이디를 반환합니다."""
+        if occurrence_dt is None:
+            return calendar_id
+        if occurrence_dt.tzinfo is None:
+            raise ValidationError("occurrence_dt 에 타임존 정보가 필요합니다.")
+
+        calendar = await self._calendar_repo.materialize_occurrence(
+            calendar_id, occurrence_dt
+        )
+        return calendar.id
@@ -1,8 +1,9 @@
 from uuid import UUID
 from app import schemas
-from app.exceptions import NotFoundError
+from app.exceptions import NotFoundError, ValidationError
 from app import orm
 from app.repositories.contact import ContactRepository
+from app.base.pagination import decode_cursor, encode_cursor
 
 
 class ContactService:
@@ -18,11 +19,23 @@ class ContactService:
         return schemas.ContactOutput.model_validate(contact)
 
     async def fetch(
-        self, user_id: int, offset: int, limit: int
-    ) -> list[schemas.ContactOutput]:
-        """복수 연락처를 조회합니다."""
-        contacts = await self._contact_repo.fetch(user_id, offset, limit)
-        return [schemas.ContactOutput.model_validate(contact) for contact in contacts]
+        self, user_id: int, offset: int, limit: int, cursor: str | None = None
+    ) -> tuple[list[schemas.ContactOutput], str | None]:
+        """복수 연락처를 조회합니다. 다음 페이지 커서를 함께 반환합니다."""
+        after = None
+        if cursor is not None:
+            try:
+                after = decode_cursor(cursor)
+            except ValueError:
+                raise ValidationError("유효하지 않은 커서입니다.")
+
+        contacts = await self._contact_repo.fetch(user_id, offset, limit, after)
+        next_cursor = None
+        if len(contacts) == limit:
+            next_cursor = encode_cursor(contacts[-1].updated_at, contacts[-1].id)
+        return [
+            schemas.ContactOutput.model_validate(contact) for contact in contacts
+        ], next_cursor
 
     async def create(
         self, user_id: int, contact_input: schemas.ContactInput
@@ -51,4 +64,7 @@ class ContactService:
     ) -> schemas.ContactOutput:
         """연락처 중요여부를 수정합니다."""
         contact = await self._contact_repo.update_contact_importance(contact_id)
+        if contact is None:
+            raise NotFoundError("연락처가 존재하지 않습니다.")
+
         return schemas.ContactOutput.model_validate(contact)
@@ -1,39 +1,73 @@
 from app import schemas
+from app.base.cache import SingleFlight, TTLCache
+from app.base.config import config
+from app.base.db import DB
 from app.exceptions import NotFoundError
-from app.orm import User
 from app.repositories.user import UserRepository
 from app.base.provider import GoogleProviderUserInfo
 
+# 유저 프로필 캐시 (다른 프로세스에서의 변경은 TTL 이 지나면 반영됩니다.)
+profile_cache: TTLCache[int, schemas.UserProfile] = TTLCache(
+    config.user_profile_cache_size, config.user_profile_cache_ttl
+)
+# 같은 uid 로 동시에 들어온 로그인은 한 번만 처리합니다.
+login_flight: SingleFlight[str, schemas.UserProfile] = SingleFlight()
 
-class UserService:
-    def __init__(self, user_repo: UserRepository) -> None:
-        self._user_repo = user_repo
+
+class LoginService:
+    """소셜 로그인으로 유저를 가져오거나 생성합니다.
+
+    같은 유저의 로그인이 결과를 공유하므로 요청 세션을 사용하지 않고,
+    별도의 세션에서 commit 까지 마친 뒤에 프로필을 반환합니다.
+    """
+
+    def __init__(self, db: DB) -> None:
+        self._db = db
 
     async def get_or_create_user(
         self, provider: str, provider_data: GoogleProviderUserInfo
     ) -> schemas.UserProfile:
-        """유저를 가져오거나 생성합니다."""
-        user = await self._user_repo.get_by_uid(provider_data["uid"])
-        if user:
-            return user.profile
-        else:
-            user = await self._user_repo.create(
-                User(
-                    uid=provider_data["uid"],
-                    provider=provider,
-                    name=provider_data["name"],
-                    email=provider_data["email"],
-                    profile_image_url=provider_data["picture"],
-                    google_access_token=provider_data["access_token"],
-                    google_refresh_token=provider_data.get("refresh_token", ""),
+        """유저를 가져오거나 생성합니다. 구글 토큰은 로그인할 때마다 갱신합니다."""
+
+        async def upsert() -> schemas.UserProfile:
+            async with (
+                self._db.admission.acquire(),
+                self._db.session(
+                    statement_timeout=config.db_statement_timeout
+                ) as session,
+            ):
+                user = await UserRepository(session).upsert(
+                    {
+                        "uid": provider_data["uid"],
+                        "provider": provider,
+                        "name": provider_data["name"],
+                        "email": provider_data["email"],
+                        "profile_image_url": provider_data["picture"],
+                        "google_access_token": provider_data["access_token"],
+                        "google_refresh_token": provider_data.get("refresh_token", ""),
+                    }
                 )
-            )
-            return user.profile
+                return user.profile
+
+        profile = await login_flight.do(provider_data["uid"], upsert)
+        profile_cache.set(profile.id, profile)
+        return profile
+
+
+class UserService:
+    def __init__(self, user_repo: UserRepository) -> None:
+        self._user_repo = user_repo
 
     async def get(self, user_id: int) -> schemas.UserProfile:
-        """유저를 조회합니다."""
-        user = await self._user_repo.get(user_id)
-        return user.profile
+        """유저를 조회합니다. 캐시된 프로필이 있으면 DB 를 조회하지 않습니다."""
+        profile = profile_cache.get(user_id)
+        if profile is None:
+            user = await self._user_repo.get(user_id)
+            if user is None:
+                raise NotFoundError(f"{user_id} 유저는 존재하지 않습니다.")
+            profile = user.profile
+            profile_cache.set(user_id, profile)
+        return profile
 
     async def fetch(self, offset: int, limit: int) -> list[schemas.UserProfile]:
         """복수 유저를 조회합니다."""
@@ -48,8 +82,11 @@ class UserService:
         if user is None:
             raise NotFoundError("유저가 존재하지 않습니다.")
 
+        # commit 전이므로 캐시를 채우지 않고 지웁니다. (다음 조회에서 다시 캐시합니다)
+        profile_cache.delete(user_id)
         return user.profile
 
     async def delete(self, user_id: int) -> None:
         """유저를 삭제합니다."""
         await self._user_repo.delete(user_id)
+        profile_cache.delete(user_id)
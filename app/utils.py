@@ -39,3 +39,26 @@ def msepoch_to_datetime(ms: float, tz: str = "UTC") -> datetime:
         Aware Datetime객체
     """
     return datetime.fromtimestamp(ms / 1000, tz=ZoneInfo(tz))
+
+
+def month_range(
+    year: int, month: int | None = None, tz: str = "UTC"
+) -> tuple[datetime, datetime]:
+    """연도(또는 월)에 해당하는 [시작, 끝) 기간을 반환합니다.
+
+    Args:
+        year: 연도
+        month: 월(기본값: 연도 전체)
+        tz: 타임존(기본값:UTC)
+
+    Returns:
+        타임존이 포함된 시작일시와 종료일시(미포함)
+    """
+    if month is None:
+        start = datetime(year, 1, 1, tzinfo=ZoneInfo(tz))
+        return start, start.replace(year=year + 1)
+
+    start = datetime(year, month, 1, tzinfo=ZoneInfo(tz))
+    if month == 12:
+        return start, start.replace(year=year + 1, month=1)
+    return start, start.replace(month=month + 1)
@@ -1,9 +1,11 @@
+from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from starlette.status import HTTP_200_OK, HTTP_204_NO_CONTENT
 
 from app import deps, schemas
+from app.base.pagination import NEXT_CURSOR_HEADER
 from app.services.calendar import CalendarService
 
 router = APIRouter()
@@ -13,19 +15,29 @@ router = APIRouter()
     "/calendars",
     status_code=HTTP_200_OK,
     response_model=list[schemas.CalendarOutput],
+    dependencies=[Depends(deps.statement_timeout(300))],
 )
 async def fetch_user_calendars(
+    response: Response,
     year: int | None = None,
     month: int | None = None,
+    from_dt: datetime | None = Query(default=None, alias="from"),
+    to_dt: datetime | None = Query(default=None, alias="to"),
     offset: int = 0,
     limit: int = 100,
-    current_user: schemas.UserProfile = Depends(deps.current_user),
+    cursor: str | None = None,
+    current_user_id: int = Depends(deps.current_user_id),
     calendar_service: CalendarService = Depends(deps.calendar_service),
 ) -> list[schemas.CalendarOutput]:
-    """유저의 모든 캘린더를 가져옵니다."""
-    calendars = await calendar_service.fetch_user_calendars(
-        current_user.id, year, month, offset, limit
+    """유저의 모든 캘린더를 가져옵니다. (주간, 일간 조회는 from, to 사용)
+
+    다음 페이지는 X-Next-Cursor 헤더 값을 cursor 로 전달해 조회합니다.
+    """
+    calendars, next_cursor = await calendar_service.fetch_user_calendars(
+        current_user_id, year, month, offset, limit, from_dt, to_dt, cursor
     )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return calendars
 
 
@@ -36,7 +48,7 @@ async def fetch_user_calendars(
 )
 async def get_calendar_by_calendar_id(
     calendar_id: UUID,
-    current_user: schemas.UserProfile = Depends(deps.current_user),
+    current_user_id: int = Depends(deps.current_user_id),
     calendar_service: CalendarService = Depends(deps.calendar_service),
 ) -> schemas.CalendarContactOutput:
     """캘린더를 조회합니다. 캘린더와 관계한 연락처도 함께 조회합니다."""
@@ -51,11 +63,14 @@ async def get_calendar_by_calendar_id(
 )
 async def update_calendar_completion(
     calendar_id: UUID,
-    current_user: schemas.UserProfile = Depends(deps.current_user),
+    occurrence_dt: datetime | None = None,
+    current_user_id: int = Depends(deps.current_user_id),
     calendar_service: CalendarService = Depends(deps.calendar_service),
 ) -> schemas.CalendarOutput:
     """일정을 완료 처리합니다."""
-    calendar = await calendar_service.update_calendar_completion(calendar_id)
+    calendar = await calendar_service.update_calendar_completion(
+        calendar_id, occurrence_dt
+    )
     return calendar
 
 
@@ -66,11 +81,14 @@ async def update_calendar_completion(
 )
 async def update_calendar_importance(
     calendar_id: UUID,
-    current_user: schemas.UserProfile = Depends(deps.current_user),
+    occurrence_dt: datetime | None = None,
+    current_user_id: int = Depends(deps.current_user_id),
     calendar_service: CalendarService = Depends(deps.calendar_service),
 ) -> schemas.CalendarOutput:
     """일정의 '중요함' 상태를 업데이트합니다."""
-    calendar = await calendar_service.update_calendar_importance(calendar_id)
+    calendar = await calendar_service.update_calendar_importance(
+        calendar_id, occurrence_dt
+    )
     return calendar
 
 
@@ -78,16 +96,23 @@ async def update_calendar_importance(
     "/contacts/{contact_id}/calendars",
     status_code=HTTP_200_OK,
     response_model=list[schemas.CalendarOutput],
+    dependencies=[Depends(deps.statement_timeout(300))],
 )
 async def fetch_calendar(
     contact_id: UUID,
-    current_user: schemas.UserProfile = Depends(deps.current_user),
+    response: Response,
+    current_user_id: int = Depends(deps.current_user_id),
     calendar_service: CalendarService = Depends(deps.calendar_service),
     offset: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
 ) -> list[schemas.CalendarOutput]:
-    """복수 캘린더를 조회합니다."""
-    calendar = await calendar_service.fetch(contact_id, offset=offset, limit=limit)
+    """복수 캘린더를 조회합니다. 다음 페이지는 X-Next-Cursor 헤더 값을 cursor 로 전달합니다."""  # noqa
+    calendar, next_cursor = await calendar_service.fetch(
+        contact_id, offset=offset, limit=limit, cursor=cursor
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return calendar
 
 
@@ -99,7 +124,7 @@ async def fetch_calendar(
 async def get_calendar(
     contact_id: UUID,
     calendar_id: UUID,
-    current_user: schemas.UserProfile = Depends(deps.current_user),
+    current_user_id: int = Depends(deps.current_user_id),
     calendar_service: CalendarService = Depends(deps.calendar_service),
 ) -> schemas.CalendarContactOutput:
     """캘린더를 조회합니다. 캘린더와 관계한 연락처도 함께 조회합니다."""
@@ -111,16 +136,18 @@ async def get_calendar(
     "/contacts/{contact_id}/calendars",
     status_code=HTTP_200_OK,
     response_model=schemas.CalendarOutput,
+    # 반복 일정은 여러 행을 생성하므로 시간을 넉넉히 줍니다.
+    dependencies=[Depends(deps.statement_timeout(5000))],
 )
 async def create_calendar(
     contact_id: UUID,
     calendar_input: schemas.CalendarInput,
-    current_user: schemas.UserProfile = Depends(deps.current_user),
+    current_user_id: int = Depends(deps.current_user_id),
     calendar_service: CalendarService = Depends(deps.calendar_service),
 ) -> schemas.CalendarOutput:
     """캘린더를 생성합니다. 반복 설정을 할 경우 recurring_input 의 값을 모두 채워주세요."""  # noqa
     calendar = await calendar_service.create(
-        current_user.id, contact_id, calendar_input
+        current_user_id, contact_id, calendar_input
     )
     return calendar
 
@@ -134,11 +161,12 @@ async def update_calendar(
     contact_id: UUID,
     calendar_id: UUID,
     calendar_input: schemas.CalendarInput,
-    current_user: schemas.UserProfile = Depends(deps.current_user),
+    occurrence_dt: datetime | None = None,
+    current_user_id: int = Depends(deps.current_user_id),
     calendar_service: CalendarService = Depends(deps.calendar_service),
 ) -> schemas.CalendarOutput:
     """캘린더를 수정합니다."""
-    calendar = await calendar_service.update(calendar_id, calendar_input)
+    calendar = await calendar_service.update(calendar_id, calendar_input, occurrence_dt)
     return calendar
 
 
@@ -150,8 +178,9 @@ async def update_calendar(
 async def delete_calendar(
     contact_id: UUID,
     calendar_id: UUID,
-    current_user: schemas.UserProfile = Depends(deps.current_user),
+    occurrence_dt: datetime | None = None,
+    current_user_id: int = Depends(deps.current_user_id),
     calendar_service: CalendarService = Depends(deps.calendar_service),
 ) -> None:
     """캘린더를 삭제합니다."""
-    await calendar_service.delete(calendar_id)
+    await calendar_service.delete(calendar_id, occurrence_dt)
@@ -1,9 +1,10 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from starlette.status import HTTP_200_OK, HTTP_204_NO_CONTENT
 
 from app import deps, schemas
+from app.base.pagination import NEXT_CURSOR_HEADER
 from app.services.contact import ContactService
 
 router = APIRouter()
@@ -13,15 +14,22 @@ router = APIRouter()
     "/contacts",
     status_code=HTTP_200_OK,
     response_model=list[schemas.ContactOutput],
+    dependencies=[Depends(deps.statement_timeout(300))],
 )
 async def fetch_contact(
-    current_user: schemas.UserProfile = Depends(deps.current_user),
+    response: Response,
+    current_user_id: int = Depends(deps.current_user_id),
     contact_service: ContactService = Depends(deps.contact_service),
     offset: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
 ) -> list[schemas.ContactOutput]:
-    """복수 연락처를 조회합니다."""
-    contact = await contact_service.fetch(current_user.id, offset=offset, limit=limit)
+    """복수 연락처를 조회합니다. 다음 페이지는 X-Next-Cursor 헤더 값을 cursor 로 전달합니다."""  # noqa
+    contact, next_cursor = await contact_service.fetch(
+        current_user_id, offset=offset, limit=limit, cursor=cursor
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return contact
 
 
@@ -32,7 +40,7 @@ async def fetch_contact(
 )
 async def get_contact(
     contact_id: UUID,
-    current_user: schemas.UserProfile = Depends(deps.current_user),
+    current_user_id: int = Depends(deps.current_user_id),
     contact_service: ContactService = Depends(deps.contact_service),
 ) -> schemas.ContactOutput:
     """연락처를 조회합니다."""
@@ -47,10 +55,10 @@ async def get_contact(
 )
 async def create_contact(
     contact_input: schemas.ContactInput,
-    current_user: schemas.UserProfile = Depends(deps.current_user),
+    current_user_id: int = Depends(deps.current_user_id),
     contact_service: ContactService = Depends(deps.contact_service),
 ) -> schemas.ContactOutput:
-    contact = await contact_service.create(current_user.id, contact_input)
+    contact = await contact_service.create(current_user_id, contact_input)
     return contact
 
 
@@ -62,7 +70,7 @@ async def create_contact(
 async def update_contact(
     contact_id: UUID,
     contact_input: schemas.ContactInput,
-    current_user: schemas.UserProfile = Depends(deps.current_user),
+    current_user_id: int = Depends(deps.current_user_id),
     contact_service: ContactService = Depends(deps.contact_service),
 ) -> schemas.ContactOutput:
     contact = await contact_service.update(contact_id, contact_input)
@@ -76,7 +84,7 @@ async def update_contact(
 )
 async def delete_contact(
     contact_id: UUID,
-    current_user: schemas.UserProfile = Depends(deps.current_user),
+    current_user_id: int = Depends(deps.current_user_id),
     contact_service: ContactService = Depends(deps.contact_service),
 ) -> None:
     await contact_service.delete(contact_id)
@@ -89,7 +97,7 @@ async def delete_contact(
 )
 async def update_contact_importance(
     contact_id: UUID,
-    current_user: schemas.UserProfile = Depends(deps.current_user),
+    current_user_id: int = Depends(deps.current_user_id),
     contact_service: ContactService = Depends(deps.contact_service),
 ) -> schemas.ContactOutput:
     """연락처의 '중요함' 상태를 업데이트합니다."""
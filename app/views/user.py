@@ -7,10 +7,14 @@ from starlette.status import HTTP_200_OK, HTTP_204_NO_CONTENT
 from app import deps, schemas
 from app.base.auth import login
 from app.base.config import config
-from app.base.provider import GoogleAuthProvider
+from app.base.provider import (
+    GoogleAuthProvider,
+    GoogleProviderUserInfo,
+    OAuthClient,
+)
 
 from app.exceptions import ValidationError
-from app.services.user import UserService
+from app.services.user import LoginService, UserService
 
 router = APIRouter()
 
@@ -32,7 +36,7 @@ async def social_login(
             "client_id": config.google_client_id,
             "redirect_uri": config.google_redirect_uri,
             "response_type": "code",
-            "scope": "email profile",
+            "scope": "openid email profile",
             "access_type": "offline",
         }
         param_string = "&".join([f"{key}={value}" for key, value in params.items()])
@@ -41,6 +45,25 @@ async def social_login(
     return RedirectResponse(redirect_url)
 
 
+async def social_user_info(
+    provider: Literal["kakao", "google"],
+    code: str,
+    oauth_client: OAuthClient = Depends(deps.oauth_client),
+) -> GoogleProviderUserInfo:
+    """소셜 로그인 제공자에서 유저 정보를 가져옵니다."""
+    if provider == "kakao":
+        raise ValidationError("아직 구현되지 않은 소셜 플랫폼입니다. 'kakao'")
+        # kakao_provider = KakaoAuthProvider(oauth_client, token)
+        # user_info = await kakao_provider.get_user_info()
+    elif provider == "google":
+        google_provider = GoogleAuthProvider(oauth_client, code)
+        await google_provider.get_access_token()
+        user_info = await google_provider.get_user_info()
+    else:
+        raise ValidationError(f"지원하지 않는 소셜 플랫폼입니다. '{provider}'")
+    return user_info
+
+
 @router.get(
     "/social-login/{provider}/callback",
     status_code=HTTP_200_OK,
@@ -50,21 +73,11 @@ async def social_login(
 async def social_login_callback(
     response: Response,
     provider: Literal["kakao", "google"],
-    code: str,
-    user_service: UserService = Depends(deps.user_service),
+    user_info: GoogleProviderUserInfo = Depends(social_user_info),
+    login_service: LoginService = Depends(deps.login_service),
 ) -> RedirectResponse:
     """소셜 로그인을 합니다."""
-    if provider == "kakao":
-        raise ValidationError("아직 구현되지 않은 소셜 플랫폼입니다. 'kakao'")
-        # kakao_provider = KakaoAuthProvider(token)
-        # user_info = kakao_provider.get_user_info()
-    elif provider == "google":
-        google_provider = GoogleAuthProvider(code)
-        google_provider.get_access_token()
-        user_info = google_provider.get_user_info()
-    else:
-        raise ValidationError(f"지원하지 않는 소셜 플랫폼입니다. '{provider}'")
-    user = await user_service.get_or_create_user(provider, user_info)
+    user = await login_service.get_or_create_user(provider, user_info)
 
     response = RedirectResponse(url=config.frontend_url)
     login(response, user)
@@ -107,11 +120,11 @@ async def logout(response: Response) -> RedirectResponse:
     response_model=schemas.UserProfile,
 )
 async def get_me(
-    current_user: schemas.UserProfile = Depends(deps.current_user),
+    current_user_id: int = Depends(deps.current_user_id),
     user_service: UserService = Depends(deps.user_service),
 ) -> schemas.UserProfile:
     """내 정보를 조회합니다. (로그인 필요 후 활성화 예정)"""
-    user_profile = await user_service.get(current_user.id)
+    user_profile = await user_service.get(current_user_id)
     return user_profile
 
 
@@ -137,15 +150,14 @@ async def fetch_users(
 )
 async def update_user(
     user_id: int,
-    current_user: schemas.UserProfile = Depends(deps.current_user),
+    current_user_id: int = Depends(deps.current_user_id),
     user_input: schemas.UserInput = Body(..., embed=True),
     user_service: UserService = Depends(deps.user_service),
 ) -> schemas.UserProfile:
     """내 정보를 수정합니다."""
-    if user_id == current_user.id:
+    if user_id == current_user_id:
         raise ValidationError("본인만 수정할 수 있습니다.")
-    await user_service.update(user_id, user_input)
-    user_profile = await user_service.get(user_id)
+    user_profile = await user_service.update(user_id, user_input)
     return user_profile
 
 
@@ -155,10 +167,10 @@ async def update_user(
 )
 async def delete_user(
     user_id: int,
-    current_user: schemas.UserProfile = Depends(deps.current_user),
+    current_user_id: int = Depends(deps.current_user_id),
     user_service: UserService = Depends(deps.user_service),
 ) -> None:
     """내 정보를 삭제합니다.(회원 탈퇴)"""
-    if current_user.id != user_id:
+    if current_user_id != user_id:
         raise ValidationError("본인만 탈퇴할 수 있습니다.")
     await user_service.delete(user_id)
@@ -0,0 +1,26 @@
+import asyncio
+import logging
+
+from app.base.config import config
+from app.base.db import db
+from app.repositories.calendar import CalendarRepository
+from app.services.calendar import CalendarService
+
+logger = logging.getLogger(__name__)
+
+
+async def extend_recurring_calendars() -> None:
+    """미리 생성한 기한이 다가온 반복 일정을 주기적으로 이어서 생성합니다."""
+    batch_size = config.calendar_recurring_worker_batch_size
+    while True:
+        try:
+            async with db.session() as session:
+                calendar_service = CalendarService(CalendarRepository(session))
+                count = await calendar_service.extend_recurring_calendars(batch_size)
+        except Exception:
+            logger.exception("반복 일정 생성 실패")
+            count = 0
+
+        # 처리할 반복 일정이 남아있다면 쉬지 않고 이어서 처리합니다.
+        if count < batch_size:
+            await asyncio.sleep(config.calendar_recurring_worker_interval)
@@ -1,3 +1,6 @@
+import asyncio
+import time
+from collections.abc import Iterator
 from typing import Any
 
 import click
@@ -109,5 +112,348 @@ def run_server(host: str, port: int) -> None:
     uvicorn.run("app.main:app", host=host, port=port, reload=True)
 
 
+@cli.command(help="Benchmark recurring calendar creation")
+@click.option(
+    "-l",
+    "--lengths",
+    default="1,30,365,1095",
+    help="Comma separated series lengths (days)",
+)
+@click.option("-r", "--repeat", type=click.INT, default=5, help="Runs per length")
+def bench_calendar_create(lengths: str, repeat: int) -> None:
+    """
+    반복 일정 길이에 따른 일정 생성 지연시간을 측정합니다.
+    측정에 사용한 데이터는 모두 롤백됩니다.
+    """
+    asyncio.run(_bench_calendar_create([int(v) for v in lengths.split(",")], repeat))
+
+
+async def _bench_calendar_create(lengths: list[int], repeat: int) -> None:
+    import datetime
+    import uuid
+
+    from app import orm, schemas
+    from app.base.db import db
+    from app.enum import CalendarRecurringFrequencyEnum
+    from app.repositories.calendar import CalendarRepository
+    from app.services.calendar import CalendarService
+    from app.utils import tz_now
+
+    async with db.session() as session:
+        user = orm.User(uid=f"bench-{uuid.uuid4()}", provider="bench", name="bench")
+        session.add(user)
+        await session.flush()
+        contact = orm.Contact(name="bench", user_id=user.id)
+        session.add(contact)
+        await session.flush()
+
+        service = CalendarService(CalendarRepository(session))
+        start_dt = tz_now()
+        click.echo(f"{'days':>8} {'p50(ms)':>10} {'max(ms)':>10}")
+        for days in lengths:
+            calendar_input = schemas.CalendarInput(
+                name="bench",
+                start_dt=start_dt,
+                is_repeat=True,
+                recurring_input=schemas.CalendarRecurringInput(
+                    start_dt=start_dt,
+                    end_dt=start_dt + datetime.timedelta(days=days - 1),
+                    interval=1,
+                    frequency=CalendarRecurringFrequencyEnum.DAY,
+                ),
+            )
+            elapsed: list[float] = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                await service.create(user.id, contact.id, calendar_input)
+                elapsed.append((time.perf_counter() - started) * 1000)
+            elapsed.sort()
+            click.echo(
+                f"{days:>8} {elapsed[len(elapsed) // 2]:>10.1f} {elapsed[-1]:>10.1f}"
+            )
+
+        await session.rollback()
+
+
+@cli.command(help="Benchmark requests per second of an API path")
+@click.option("-p", "--path", default="/v1/contacts", help="Request path")
+@click.option(
+    "-n", "--requests", "total", type=click.INT, default=2000, help="Total requests"
+)
+@click.option(
+    "-c", "--concurrency", type=click.INT, default=20, help="Concurrent requests"
+)
+def bench_rps(path: str, total: int, concurrency: int) -> None:
+    """
+    서버를 띄우지 않고 ASGI 앱을 직접 호출해 초당 처리량을 측정합니다.
+    연락처가 있는 유저의 토큰으로 요청합니다.
+    """
+    asyncio.run(_bench_rps(path, total, concurrency))
+
+
+async def _bench_rps(path: str, total: int, concurrency: int) -> None:
+    import datetime
+
+    import sqlalchemy as sa
+    from starlette.types import Message, Scope
+
+    from app import orm
+    from app.base.auth import create_token
+    from app.base.db import db
+    from app.main import app
+
+    async with db.session() as session:
+        user_id = await session.scalar(
+            sa.select(orm.Contact.user_id).where(orm.Contact.deleted_at.is_(None))
+        )
+    if user_id is None:
+        raise click.ClickException("연락처 시드 데이터가 필요합니다.")
+    cookie = "; ".join(
+        f"{key}={create_token({'user_id': user_id}, datetime.timedelta(hours=1))}"
+        for key in ("access_token", "refresh_token")
+    )
+    scope: Scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "https",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"cookie", cookie.encode())],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 443),
+    }
+    statuses: dict[int, int] = {}
+
+    async def request() -> None:
+        messages: list[Message] = [
+            {"type": "http.request", "body": b"", "more_body": False}
+        ]
+        response_complete = asyncio.Event()
+
+        async def receive() -> Message:
+            if messages:
+                return messages.pop()
+            # 서버처럼 응답이 끝날 때까지 기다린 뒤 연결 종료를 알립니다.
+            await response_complete.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                statuses[message["status"]] = statuses.get(message["status"], 0) + 1
+            elif not message.get("more_body", False):
+                response_complete.set()
+
+        await app(dict(scope), receive, send)
+
+    async def client(count: int) -> None:
+        for _ in range(count):
+            await request()
+
+    for _ in range(concurrency):  # 연결 풀과 캐시를 미리 채웁니다.
+        await request()
+    statuses.clear()
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *[
+            client(total // concurrency + (i < total % concurrency))
+            for i in range(concurrency)
+        ]
+    )
+    elapsed = time.perf_counter() - started
+    click.echo(f"{path} {total} requests, concurrency {concurrency}")
+    click.echo(f"status {statuses}")
+    click.echo(f"{total / elapsed:.0f} req/s, {elapsed * 1000 / total:.2f} ms/req")
+    for url, stats in db.pool_stats().items():
+        click.echo(
+            f"pool {url} size {stats['size']}, overflow {stats['overflow']}, "
+            f"wait avg {stats['wait_seconds'] * 1000 / max(stats['wait_count'], 1):.2f}"
+            f" ms, max {stats['wait_max_seconds'] * 1000:.2f} ms"
+        )
+
+
+@cli.command(help="Check that the app works through PgBouncer")
+@click.option("-c", "--concurrency", type=click.INT, default=50, help="Sessions")
+@click.option("-n", "--rounds", type=click.INT, default=20, help="Rounds per session")
+def check_pgbouncer(concurrency: int, rounds: int) -> None:
+    """
+    DB_URL 을 PgBouncer 주소로, DB_PGBOUNCER=true 로 설정하고 실행합니다.
+    여러 세션에서 같은 쿼리를 동시에 반복해 prepared statement 충돌이 없는지 확인합니다.
+    """
+    if not config.db_pgbouncer:
+        click.echo("DB_PGBOUNCER 가 꺼져 있습니다.")
+    if not asyncio.run(_check_pgbouncer(concurrency, rounds)):
+        raise SystemExit(1)
+
+
+async def _check_pgbouncer(concurrency: int, rounds: int) -> bool:
+    import sqlalchemy as sa
+
+    from app import orm
+    from app.base.db import db
+
+    errors: dict[str, int] = {}
+
+    async def worker() -> None:
+        for i in range(rounds):
+            try:
+                async with db.session(readonly=i % 2 == 0) as session:
+                    for _ in range(2):
+                        await session.scalars(
+                            sa.select(orm.User).order_by(orm.User.id).limit(1)
+                        )
+                    await session.scalar(
+                        sa.select(sa.func.count()).select_from(orm.Contact)
+                    )
+            except Exception as e:
+                key = f"{type(e).__name__}: {str(e).splitlines()[0]}"
+                errors[key] = errors.get(key, 0) + 1
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    await db.dispose()
+    click.echo(f"{concurrency * rounds} transactions, {sum(errors.values())} failed")
+    for key, count in errors.items():
+        click.echo(f"FAIL {count}x {key}")
+    return not errors
+
+
+@cli.command(help="Check that repository queries use indexes")
+def check_indexes() -> None:
+    """
+    시드 데이터로 저장소 쿼리를 실행하고 실행계획을 확인합니다.
+    순차 탐색(Seq Scan)하는 쿼리가 있으면 실패합니다. 실행한 쿼리는 모두 롤백됩니다.
+    """
+    if not asyncio.run(_check_indexes()):
+        raise SystemExit(1)
+
+
+async def _check_indexes() -> bool:
+    import json
+    import uuid
+
+    import sqlalchemy as sa
+
+    from app import orm, schemas
+    from app.base.db import db
+    from app.repositories.calendar import CalendarRepository
+    from app.repositories.contact import ContactRepository
+    from app.repositories.user import UserRepository
+    from app.utils import month_range, tz_now
+
+    statements: list[tuple[str, Any]] = []
+
+    def capture(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        if not executemany and statement.split(None, 1)[0].upper() in (
+            "SELECT",
+            "UPDATE",
+            "DELETE",
+        ):
+            statements.append((statement, parameters))
+
+    async with db.session() as session:
+        live = orm.Calendar.deleted_at.is_(None)
+        calendar = await session.scalar(
+            sa.select(orm.Calendar)
+            .join(orm.Calendar.contact)
+            .where(
+                live,
+                orm.Calendar.is_virtual.is_(False),
+                orm.Contact.deleted_at.is_(None),
+            )
+        )
+        if calendar is None:
+            raise click.ClickException("일정 시드 데이터가 필요합니다.")
+        master = await session.scalar(
+            sa.select(orm.Calendar).where(live, orm.Calendar.is_virtual.is_(True))
+        )
+        user = await session.get(orm.User, calendar.user_id)
+        if user is None:
+            raise click.ClickException("일정의 유저가 존재하지 않습니다.")
+        start, end = month_range(calendar.start_dt.year, calendar.start_dt.month)
+        after = (calendar.start_dt, calendar.id)
+
+        engine = session.bind.sync_engine
+        sa.event.listen(engine, "before_cursor_execute", capture)
+        try:
+            user_repo = UserRepository(session)
+            await user_repo.get(user.id)
+            await user_repo.get_by_uid(user.uid)
+            await user_repo.fetch(0, 100)
+
+            contact_repo = ContactRepository(session)
+            await contact_repo.get(calendar.contact_id)
+            await contact_repo.fetch(user.id, 0, 100)
+            await contact_repo.fetch(user.id, 0, 100, (tz_now(), uuid.UUID(int=0)))
+
+            calendar_repo = CalendarRepository(session)
+            await calendar_repo.get(calendar.id)
+            await calendar_repo.fetch(calendar.contact_id, 0, 100)
+            await calendar_repo.fetch(calendar.contact_id, 0, 100, after)
+            await calendar_repo.fetch_user_calendars(user.id, start, end, 0, 100)
+            await calendar_repo.fetch_user_calendars(user.id, start, end, 0, 100, after)
+            if master is not None:
+                await calendar_repo.fetch(master.contact_id, 0, 100)
+                await calendar_repo.fetch_user_calendars(
+                    master.user_id, start, end, 0, 100
+                )
+            await calendar_repo.claim_recurrings(tz_now(), 100)
+            await calendar_repo.fetch_live_recurring_ids(
+                [calendar.calendar_recurring_id or uuid.uuid4()]
+            )
+            await calendar_repo.update_calendar_completion(calendar.id)
+            await calendar_repo.update_calendar_importance(calendar.id)
+            await calendar_repo.update(
+                calendar.id,
+                schemas.CalendarInput(name=calendar.name, start_dt=calendar.start_dt),
+            )
+            await calendar_repo.delete(calendar.id)
+            await contact_repo.update_contact_importance(calendar.contact_id)
+            await contact_repo.delete(calendar.contact_id)
+            await user_repo.update(user.id, schemas.UserInput(name=user.name))
+            await user_repo.delete(user.id)
+        finally:
+            sa.event.remove(engine, "before_cursor_execute", capture)
+
+        # 인덱스로 처리할 수 있는 쿼리는 순차 탐색을 끄면 항상 인덱스를 사용합니다.
+        connection = await session.connection()
+        await connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        ok = True
+        for statement, parameters in statements:
+            res = await connection.exec_driver_sql(
+                "EXPLAIN (FORMAT JSON) " + statement, parameters
+            )
+            plan = res.scalar_one()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            seq_scans = sorted(set(_seq_scans(plan[0]["Plan"])))
+            click.echo(
+                f"{'FAIL' if seq_scans else 'OK':<5}{' '.join(statement.split())[:110]}"
+            )
+            if seq_scans:
+                click.echo(f"     Seq Scan on {', '.join(seq_scans)}")
+                ok = False
+
+        await session.rollback()
+    return ok
+
+
+def _seq_scans(plan: dict[str, Any]) -> Iterator[str]:
+    if plan["Node Type"] == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from _seq_scans(child)
+
+
 if __name__ == "__main__":
     cli()
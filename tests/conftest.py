@@ -0,0 +1,52 @@
+import os
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+import pytest
+
+# 테스트에 필요한 필수 설정의 기본값 (환경 변수가 있으면 그 값을 사용합니다.)
+for key, value in {
+    "SECRET_KEY": "test-secret",
+    "DB_URL": "postgresql+asyncpg://user@localhost:5432/postgres",
+    "GOOGLE_CLIENT_ID": "test-client-id",
+    "GOOGLE_CLIENT_SECRET": "test-client-secret",
+    "GOOGLE_REDIRECT_URI": "http://localhost/callback",
+    "FRONTEND_URL": "http://localhost",
+    "FRONTEND_DOMAIN": "localhost",
+}.items():
+    os.environ.setdefault(key, value)
+
+
+@pytest.fixture
+def make_master() -> Callable[..., Any]:
+    """가상 반복 일정의 원본을 만드는 함수를 반환합니다."""
+    from app import orm
+
+    def make(
+        start_dt: datetime,
+        frequency: str = "일",
+        days: int = 10,
+        master_id: uuid.UUID | None = None,
+    ) -> orm.Calendar:
+        recurring = orm.CalendarRecurring(
+            id=uuid.uuid4(),
+            start_dt=start_dt,
+            end_dt=start_dt + timedelta(days=days),
+            interval=1,
+            frequency=frequency,
+            utc_offset=int(start_dt.utcoffset().total_seconds()),
+        )
+        master = orm.Calendar(
+            id=master_id or uuid.uuid4(),
+            name="반복",
+            start_dt=start_dt,
+            end_dt=start_dt + timedelta(hours=1),
+            is_virtual=True,
+            calendar_recurring_id=recurring.id,
+        )
+        master.calendar_recurring = recurring
+        return master
+
+    return make
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from app.base.cache import SingleFlight
+
+
+class Counter:
+    def __init__(self, fail: int = 0) -> None:
+        self.calls = 0
+        self._fail = fail
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> int:
+        self.calls += 1
+        calls = self.calls
+        await self.release.wait()
+        if calls <= self._fail:
+            raise RuntimeError("실패")
+        return calls
+
+
+@pytest.mark.asyncio
+async def test_shares_result():
+    flight: SingleFlight[str, int] = SingleFlight()
+    fn = Counter()
+
+    tasks = [asyncio.create_task(flight.do("key", fn)) for _ in range(5)]
+    await asyncio.sleep(0)
+    fn.release.set()
+
+    assert await asyncio.gather(*tasks) == [1] * 5
+    assert fn.calls == 1
+    assert flight.shared == 4
+
+
+@pytest.mark.asyncio
+async def test_leader_cancellation_does_not_cancel_followers():
+    flight: SingleFlight[str, int] = SingleFlight()
+    fn = Counter()
+
+    leader = asyncio.create_task(flight.do("key", fn))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("key", fn))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    await asyncio.sleep(0)
+    fn.release.set()
+
+    assert await follower == 1
+    assert leader.cancelled()
+    assert fn.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_followers_fall_back_on_failure():
+    flight: SingleFlight[str, int] = SingleFlight()
+    fn = Counter(fail=1)
+
+    leader = asyncio.create_task(flight.do("key", fn))
+    await asyncio.sleep(0)
+    followers = [asyncio.create_task(flight.do("key", fn)) for _ in range(2)]
+    await asyncio.sleep(0)
+    fn.release.set()
+
+    with pytest.raises(RuntimeError):
+        await leader
+    # 공유한 호출이 실패하면 각자 다시 실행합니다.
+    assert sorted(await asyncio.gather(*followers)) == [2, 3]
+    assert fn.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_key_is_released_after_call():
+    flight: SingleFlight[str, int] = SingleFlight()
+    fn = Counter()
+    fn.release.set()
+
+    assert await flight.do("key", fn) == 1
+    assert await flight.do("key", fn) == 2
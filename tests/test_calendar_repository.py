@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+from uuid import UUID, uuid4
+
+import pytest
+
+from app import orm
+from app.repositories.calendar import CalendarRepository
+
+KST = timezone(timedelta(hours=9))
+START = datetime(2026, 10, 1, 9, tzinfo=timezone.utc)
+
+
+def make_calendar(start_dt: datetime) -> orm.Calendar:
+    return orm.Calendar(id=uuid4(), name="일정", start_dt=start_dt)
+
+
+def make_repo(
+    exceptions: list[tuple[UUID, datetime]] | None = None
+) -> CalendarRepository:
+    session = AsyncMock()
+    # 개별 수정된 반복 일정 조회 결과
+    session.execute.return_value = exceptions or []
+    return CalendarRepository(session)
+
+
+@pytest.mark.asyncio
+async def test_merge_occurrences_orders_stored_and_virtual(make_master):
+    master = make_master(START)
+    stored = [make_calendar(START + timedelta(hours=1, days=d)) for d in (0, 2)]
+
+    merged = await make_repo()._merge_occurrences(stored, [master], 0, 5)
+
+    assert [(c.start_dt, c.name) for c in merged] == [
+        (START, "반복"),
+        (START + timedelta(hours=1), "일정"),
+        (START + timedelta(days=1), "반복"),
+        (START + timedelta(days=2), "반복"),
+        (START + timedelta(days=2, hours=1), "일정"),
+    ]
+    assert all(c.id == master.id for c in merged if c.name == "반복")
+    assert merged[2].end_dt == START + timedelta(days=1, hours=1)
+
+
+@pytest.mark.asyncio
+async def test_merge_occurrences_offset_limit_and_range(make_master):
+    master = make_master(START)
+
+    merged = await make_repo()._merge_occurrences(
+        [], [master], 1, 2, START + timedelta(days=3), START + timedelta(days=8)
+    )
+
+    assert [c.start_dt for c in merged] == [
+        START + timedelta(days=4),
+        START + timedelta(days=5),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_merge_occurrences_skips_exceptions(make_master):
+    master = make_master(START)
+    edited = START + timedelta(days=1)
+    moved = make_calendar(START + timedelta(days=1, hours=3))
+
+    merged = await make_repo(
+        [(master.calendar_recurring_id, edited)]
+    )._merge_occurrences([moved], [master], 0, 3)
+
+    assert [c.start_dt for c in merged] == [START, moved.start_dt, START + timedelta(2)]
+
+
+@pytest.mark.asyncio
+async def test_merge_occurrences_after_cursor(make_master):
+    master = make_master(START)
+    master.id = UUID(int=5)
+    day = START + timedelta(days=1)
+
+    # 같은 시작일시는 아이디 순으로 커서 이후의 일정만 반환합니다.
+    before = await make_repo()._merge_occurrences(
+        [], [master], 0, 2, after=(day, UUID(int=4))
+    )
+    assert [c.start_dt for c in before] == [day, day + timedelta(days=1)]
+
+    after = await make_repo()._merge_occurrences(
+        [], [master], 0, 2, after=(day, UUID(int=6))
+    )
+    assert [c.start_dt for c in after] == [
+        day + timedelta(days=1),
+        day + timedelta(days=2),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_merge_occurrences_monthly_in_series_timezone(make_master):
+    # 한국 시간 매월 1일 07:00 반복 일정을 DB 에서 UTC 로 읽어온 경우
+    master = make_master(datetime(2026, 1, 1, 7, tzinfo=KST), "월", 365)
+    master.start_dt = master.start_dt.astimezone(timezone.utc)
+
+    merged = await make_repo()._merge_occurrences([], [master], 0, 12)
+
+    assert [c.start_dt.astimezone(KST).day for c in merged] == [1] * 12
+    assert all(c.start_dt.tzinfo == timezone.utc for c in merged)
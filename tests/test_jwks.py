@@ -0,0 +1,223 @@
+import asyncio
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from app.base import jwks
+from app.base.config import config
+from app.base.jwks import JWKSCache, cache_max_age
+from app.base.provider import google_jwks, verify_google_id_token
+from app.exceptions import ValidationError
+
+
+def generate_key() -> rsa.RSAPrivateKey:
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+KEY = generate_key()
+OTHER_KEY = generate_key()
+
+
+def make_jwk(key: rsa.RSAPrivateKey, kid: str) -> dict[str, Any]:
+    jwk = RSAAlgorithm.to_jwk(key.public_key(), as_dict=True)
+    return {**jwk, "kid": kid, "alg": "RS256", "use": "sig"}
+
+
+def make_claims(**overrides: Any) -> dict[str, Any]:
+    now = int(time.time())
+    claims = {
+        "iss": "https://accounts.google.com",
+        "aud": config.google_client_id,
+        "sub": "1234",
+        "email": "user@example.com",
+        "iat": now,
+        "exp": now + 3600,
+    }
+    claims.update(overrides)
+    return claims
+
+
+def make_token(
+    key: rsa.RSAPrivateKey = KEY, kid: str = "key-1", **overrides: Any
+) -> str:
+    return jwt.encode(
+        make_claims(**overrides), key, algorithm="RS256", headers={"kid": kid}
+    )
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class FakeJWKS:
+    """JWKS 응답을 흉내내는 OAuthClient 입니다. 요청 횟수를 셉니다."""
+
+    def __init__(self, keys: list[dict[str, Any]]) -> None:
+        self.keys = keys
+        self.status_code = 200
+        self.headers = {"Cache-Control": "public, max-age=3600"}
+        self.calls = 0
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        self.calls += 1
+        # 동시에 들어온 요청이 기다리도록 한 번 양보합니다.
+        await asyncio.sleep(0.01)
+        return httpx.Response(
+            self.status_code, json={"keys": self.keys}, headers=self.headers
+        )
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(jwks, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def client(clock: Clock) -> Iterator[FakeJWKS]:
+    google_jwks.clear()
+    yield FakeJWKS([make_jwk(KEY, "key-1")])
+    google_jwks.clear()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "issuer", ["accounts.google.com", "https://accounts.google.com"]
+)
+async def test_verify_id_token(client: FakeJWKS, issuer: str):
+    payload = await verify_google_id_token(client, make_token(iss=issuer))
+
+    assert payload["sub"] == "1234"
+    assert payload["email"] == "user@example.com"
+    assert client.calls == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"aud": "another-client"},
+        {"exp": int(time.time()) - 60},
+        {"iss": "https://evil.example.com"},
+        {"sub": None},
+    ],
+    ids=["aud", "exp", "iss", "sub"],
+)
+async def test_invalid_claims(client: FakeJWKS, overrides: dict[str, Any]):
+    claims = {k: v for k, v in make_claims(**overrides).items() if v is not None}
+    token = jwt.encode(claims, KEY, algorithm="RS256", headers={"kid": "key-1"})
+
+    with pytest.raises(ValidationError):
+        await verify_google_id_token(client, token)
+
+
+@pytest.mark.asyncio
+async def test_tampered_payload(client: FakeJWKS):
+    header, _, signature = make_token().split(".")
+    _, payload, _ = make_token(sub="9999").split(".")
+
+    with pytest.raises(ValidationError):
+        await verify_google_id_token(client, f"{header}.{payload}.{signature}")
+
+
+@pytest.mark.asyncio
+async def test_wrong_key(client: FakeJWKS):
+    with pytest.raises(ValidationError):
+        await verify_google_id_token(client, make_token(OTHER_KEY))
+
+
+@pytest.mark.asyncio
+async def test_hs256_is_rejected(client: FakeJWKS):
+    token = jwt.encode(
+        make_claims(), "secret", algorithm="HS256", headers={"kid": "key-1"}
+    )
+
+    with pytest.raises(ValidationError):
+        await verify_google_id_token(client, token)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_verifications_fetch_once(client: FakeJWKS):
+    token = make_token()
+
+    await asyncio.gather(*[verify_google_id_token(client, token) for _ in range(10)])
+
+    assert client.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_refetch_is_limited(client: FakeJWKS, clock: Clock):
+    cache = JWKSCache("https://example.com/certs", min_refresh_interval=60)
+    await cache.get_key(client.get, "key-1")
+
+    # 모르는 kid 는 min_refresh_interval 에 한 번만 다시 가져옵니다.
+    with pytest.raises(ValidationError):
+        await cache.get_key(client.get, "unknown")
+    assert client.calls == 1
+
+    clock.now += 61
+    for _ in range(3):
+        with pytest.raises(ValidationError):
+            await cache.get_key(client.get, "unknown")
+    assert client.calls == 2
+
+    clock.now += 30
+    with pytest.raises(ValidationError):
+        await cache.get_key(client.get, "unknown")
+    assert client.calls == 2
+
+    # 키가 교체되었다면 간격이 지난 뒤 새 키를 가져옵니다.
+    client.keys = [make_jwk(OTHER_KEY, "key-2")]
+    clock.now += 31
+    assert await cache.get_key(client.get, "key-2") is not None
+    assert client.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_cache_control_expiry(client: FakeJWKS, clock: Clock):
+    client.headers = {"Cache-Control": "public, max-age=100", "Age": "40"}
+    cache = JWKSCache("https://example.com/certs")
+
+    await cache.get_key(client.get, "key-1")
+    clock.now += 59
+    await cache.get_key(client.get, "key-1")
+    assert client.calls == 1
+
+    clock.now += 2
+    await cache.get_key(client.get, "key-1")
+    assert client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_failure(client: FakeJWKS):
+    client.status_code = 503
+
+    with pytest.raises(ValidationError):
+        await verify_google_id_token(client, make_token())
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({"Cache-Control": "public, max-age=3600"}, 3600),
+        ({"Cache-Control": "public, max-age=3600", "Age": "600"}, 3000),
+        ({"Cache-Control": "max-age=60", "Age": "120"}, 0),
+        ({"Cache-Control": "max-age=60", "Age": "invalid"}, 60),
+        ({"Cache-Control": "no-cache, max-age=60"}, 0),
+        ({"Cache-Control": "no-store"}, 0),
+        ({}, 0),
+    ],
+)
+def test_cache_max_age(headers: dict[str, str], expected: float):
+    assert cache_max_age(httpx.Headers(headers)) == expected
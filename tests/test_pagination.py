@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+from uuid import UUID, uuid4
+
+import pytest
+
+from app import orm
+from app.base.pagination import decode_cursor, encode_cursor
+from app.repositories.calendar import CalendarRepository
+
+START = datetime(2026, 10, 1, 9, tzinfo=timezone.utc)
+
+
+def test_cursor_round_trip():
+    dt = datetime(2026, 10, 1, 9, 30, 15, 123456, tzinfo=timezone(timedelta(hours=9)))
+    item_id = uuid4()
+
+    cursor = encode_cursor(dt, item_id)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (dt, item_id)
+    assert decode_cursor(cursor)[0].utcoffset() == timedelta(hours=9)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-a-cursor",
+        encode_cursor(datetime(2026, 10, 1), uuid4()),  # 타임존 없음
+        encode_cursor(START, uuid4()) + "!",
+        "MjAyNi0xMC0wMVQwOTowMDowMCswMDowMA",  # 아이디 없음
+    ],
+)
+def test_decode_cursor_rejects_invalid(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_across_boundary(make_master):
+    # 같은 시작일시의 일정이 페이지 경계에 걸치도록 만듭니다.
+    stored = sorted(
+        (
+            orm.Calendar(id=UUID(int=i), start_dt=START + timedelta(days=d))
+            for i, d in [(10, 0), (60, 0), (20, 1), (30, 1), (70, 1), (40, 3)]
+        ),
+        key=lambda calendar: (calendar.start_dt, calendar.id),
+    )
+    master = make_master(START, days=5, master_id=UUID(int=50))
+    session = AsyncMock()
+    session.execute.return_value = []
+    repo = CalendarRepository(session)
+
+    expected = await repo._merge_occurrences(stored, [master], 0, 100)
+    assert len(expected) == len(stored) + 6
+
+    pages: list[list[orm.Calendar]] = []
+    after = None
+    while True:
+        # DB 에서 (start_dt, id) > after 로 조회한 결과를 흉내냅니다.
+        rows = [c for c in stored if after is None or (c.start_dt, c.id) > after]
+        page = await repo._merge_occurrences(rows, [master], 0, 3, after=after)
+        pages.append(page)
+        if len(page) < 3:
+            break
+        after = decode_cursor(encode_cursor(page[-1].start_dt, page[-1].id))
+
+    keys = [(c.start_dt, c.id) for page in pages for c in page]
+    assert keys == [(c.start_dt, c.id) for c in expected]
+    assert [len(page) for page in pages] == [3, 3, 3, 3, 0]
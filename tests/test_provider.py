@@ -0,0 +1,156 @@
+import asyncio
+import json
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+import pytest_asyncio
+from anyio.to_thread import current_default_thread_limiter
+
+from app.base import provider
+from app.base.provider import GoogleAuthProvider, KakaoAuthProvider, OAuthClient
+from app.exceptions import ValidationError
+
+
+class FakeServer:
+    """미리 정한 응답을 차례로 돌려주고 받은 요청을 기록하는 HTTP 서버입니다."""
+
+    def __init__(self) -> None:
+        # (상태 코드, 본문, 지연 시간(초)) 를 차례로 사용하고 마지막 응답은 반복합니다.
+        self.responses: list[tuple[int, dict, float]] = [(200, {}, 0)]
+        self.requests: list[tuple[str, str]] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                self.rfile.read(length)
+                server.requests.append((self.command, self.path))
+                index = min(len(server.requests), len(server.responses)) - 1
+                status, body, delay = server.responses[index]
+                time.sleep(delay)
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = _respond
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def calls(self, method: str) -> int:
+        return sum(1 for command, _ in self.requests if command == method)
+
+
+@pytest.fixture
+def server(monkeypatch: pytest.MonkeyPatch) -> Iterator[FakeServer]:
+    server = FakeServer()
+    server.start()
+    monkeypatch.setattr(provider, "GOOGLE_TOKEN_URL", f"{server.url}/token")
+    monkeypatch.setattr(provider, "GOOGLE_USER_INFO_URL", f"{server.url}/userinfo")
+    monkeypatch.setattr(provider, "KAKAO_USER_INFO_URL", f"{server.url}/kakao")
+    yield server
+    server.stop()
+
+
+@pytest_asyncio.fixture
+async def client() -> AsyncIterator[OAuthClient]:
+    client = OAuthClient(timeout=0.5, retries=2, pool_size=2)
+    yield client
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_get_retries_on_5xx(server: FakeServer, client: OAuthClient):
+    server.responses = [(503, {}, 0), (502, {}, 0), (200, {"id": 1}, 0)]
+
+    user_info = await KakaoAuthProvider(client, "token").get_user_info()
+
+    assert user_info == {"uid": "1"}
+    assert server.requests == [("GET", "/kakao")] * 3
+
+
+@pytest.mark.asyncio
+async def test_get_gives_up_after_retries(server: FakeServer, client: OAuthClient):
+    server.responses = [(503, {"msg": "unavailable"}, 0)]
+
+    with pytest.raises(ValidationError):
+        await KakaoAuthProvider(client, "token").get_user_info()
+    assert server.calls("GET") == 3
+
+
+@pytest.mark.asyncio
+async def test_token_post_is_not_retried_after_response(
+    server: FakeServer, client: OAuthClient
+):
+    # 인가 코드는 한 번만 쓸 수 있으므로 5xx 응답을 받아도 다시 보내지 않습니다.
+    server.responses = [(503, {"error_description": "unavailable"}, 0)]
+
+    with pytest.raises(ValidationError, match="unavailable"):
+        await GoogleAuthProvider(client, code="code").get_access_token()
+    assert server.requests == [("POST", "/token")]
+
+
+@pytest.mark.asyncio
+async def test_token_exchange_and_user_info(server: FakeServer, client: OAuthClient):
+    server.responses = [
+        (200, {"access_token": "access", "refresh_token": "refresh"}, 0),
+        (200, {"id": "42", "email": "e@x", "name": "n", "picture": "p"}, 0),
+    ]
+    google = GoogleAuthProvider(client, code="code")
+
+    assert await google.get_access_token() == "access"
+    user_info = await google.get_user_info()
+
+    assert user_info["uid"] == "42"
+    assert user_info["refresh_token"] == "refresh"
+    assert server.requests == [("POST", "/token"), ("GET", "/userinfo")]
+
+
+@pytest.mark.asyncio
+async def test_timeout(server: FakeServer):
+    server.responses = [(200, {"id": 1}, 0.3)]
+    client = OAuthClient(timeout=0.1, retries=2, pool_size=1)
+
+    started = time.monotonic()
+    with pytest.raises(httpx.ReadTimeout):
+        await KakaoAuthProvider(client, "token").get_user_info()
+    assert time.monotonic() - started < 1.5
+    assert server.calls("GET") == 3
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_does_not_use_threadpool(server: FakeServer, client: OAuthClient):
+    server.responses = [(200, {"id": 1}, 0)]
+    # 스레드풀이 모두 사용 중이어도 제공자 호출은 기다리지 않습니다.
+    limiter = current_default_thread_limiter()
+    borrowers = [object() for _ in range(int(limiter.total_tokens))]
+    for borrower in borrowers:
+        limiter.acquire_on_behalf_of_nowait(borrower)
+    try:
+        user_info = await asyncio.wait_for(
+            KakaoAuthProvider(client, "token").get_user_info(), timeout=1
+        )
+    finally:
+        for borrower in borrowers:
+            limiter.release_on_behalf_of(borrower)
+
+    assert user_info == {"uid": "1"}
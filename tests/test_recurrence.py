@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta, timezone
+
+from app.base import recurrence
+
+KST = timezone(timedelta(hours=9))
+
+
+def test_occurrences_in_range():
+    dtstart = datetime(2026, 10, 1, 9, tzinfo=timezone.utc)
+    dts = list(
+        recurrence.occurrences(
+            "일",
+            2,
+            dtstart,
+            dtstart + timedelta(days=30),
+            start=dtstart + timedelta(days=3),
+            end=dtstart + timedelta(days=9),
+        )
+    )
+    assert dts == [dtstart + timedelta(days=d) for d in (4, 6, 8)]
+
+
+def test_occurrences_until_is_inclusive():
+    dtstart = datetime(2026, 10, 1, 9, tzinfo=timezone.utc)
+    dts = list(recurrence.occurrences("주", 1, dtstart, dtstart + timedelta(weeks=2)))
+    assert dts == [dtstart + timedelta(weeks=w) for w in range(3)]
+
+
+def test_monthly_occurrences_follow_series_timezone():
+    # 한국 시간 매월 1일 07:00 은 UTC 로 전달 말일 22:00 입니다.
+    dtstart = datetime(2026, 1, 1, 7, tzinfo=KST)
+    until = datetime(2026, 12, 31, tzinfo=KST)
+    expected = [datetime(2026, month, 1, 7, tzinfo=KST) for month in range(1, 13)]
+
+    assert list(recurrence.occurrences("월", 1, dtstart, until)) == expected
+
+    # DB 에서 UTC 로 읽어온 시작일시도 만든 타임존 기준으로 반복합니다.
+    stored = dtstart.astimezone(timezone.utc)
+    offset = recurrence.utc_offset(dtstart)
+    assert offset == 9 * 3600
+    assert list(recurrence.occurrences("월", 1, stored, until, utc_offset=offset)) == (
+        expected
+    )
+    # UTC 로 계산하면 31일이 없는 달을 건너뜁니다.
+    assert len(list(recurrence.occurrences("월", 1, stored, until))) < len(expected)
+
+
+def test_yearly_occurrences_follow_series_timezone():
+    dtstart = datetime(2026, 3, 1, 0, 30, tzinfo=KST)  # UTC 로는 2월 28일
+    until = datetime(2030, 12, 31, tzinfo=KST)
+    dts = recurrence.occurrences(
+        "년", 1, dtstart.astimezone(timezone.utc), until, utc_offset=9 * 3600
+    )
+    assert [(dt.month, dt.day) for dt in dts] == [(3, 1)] * 5
+
+
+def test_compile_rrule_cache_distinguishes_timezone():
+    dtstart = datetime(2026, 1, 1, 7, tzinfo=KST)
+    until = datetime(2026, 6, 30, tzinfo=KST)
+    local = recurrence.compile_rrule("월", 1, dtstart, until)
+    utc = recurrence.compile_rrule("월", 1, dtstart.astimezone(timezone.utc), until)
+    assert local is not utc
+    assert list(local) != list(utc)